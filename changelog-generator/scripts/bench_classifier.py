@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the commit classification hot loop.
+Usage: python bench_classifier.py [--count N] [--repeat N] [--rules FILE] [--json]
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+
+import generate_changelog
+
+SUBJECT_WORDS = ['parser', 'cache', 'login', 'retry', 'docs', 'config', 'build', 'api',
+                 'handle', 'empty', 'input', 'update', 'remove', 'legacy', 'flag', 'timeout']
+SCOPES = ['core', 'ui', 'cli', 'db', 'auth']
+TYPES = list(generate_changelog.CATEGORY_MAP) + ['chore', 'ci', 'test', 'style']
+
+
+def make_corpus(count, seed=0):
+    """Build a deterministic synthetic corpus mixing the message shapes seen in practice."""
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(count):
+        words = ' '.join(rng.choices(SUBJECT_WORDS, k=rng.randint(3, 8)))
+        shape = rng.random()
+        if shape < 0.5:
+            message = f"{rng.choice(TYPES)}: {words}"
+        elif shape < 0.75:
+            message = f"{rng.choice(TYPES)}({rng.choice(SCOPES)}): {words}"
+        elif shape < 0.8:
+            message = f"{rng.choice(TYPES)}!: {words}"
+        elif shape < 0.85:
+            message = f"{rng.choice(TYPES)}: {words}\n\nBREAKING CHANGE: {words}"
+        else:
+            message = words.capitalize()
+        corpus.append(message)
+    return corpus
+
+
+def bench(name, fn, corpus, repeat):
+    """Time `fn(corpus)` and return the best run in commits per second."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(corpus)
+        best = min(best, time.perf_counter() - start)
+    return {'name': name, 'seconds': best, 'commits_per_second': len(corpus) / best}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark commit classification throughput')
+    parser.add_argument('--count', type=int, default=1_000_000, help='Number of synthetic messages')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per case; the best is reported')
+    parser.add_argument('--rules', metavar='FILE', help='JSON rules file to benchmark')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    classifier = (generate_changelog.load_rules(args.rules) if args.rules
+                  else generate_changelog.CLASSIFIER)
+    corpus = make_corpus(args.count)
+
+    results = [
+        bench('classify_many', classifier.classify_many, corpus, args.repeat),
+        bench('categorize_commit', lambda msgs: [generate_changelog.categorize_commit(m) for m in msgs],
+              corpus, args.repeat),
+    ]
+
+    if args.json:
+        json.dump({'count': args.count, 'results': results}, sys.stdout, indent=2)
+        print()
+        return
+
+    print(f"{args.count:,} messages, best of {args.repeat}")
+    for result in results:
+        print(f"  {result['name']:<20} {result['commits_per_second']:>14,.0f} commits/s"
+              f"  ({result['seconds']:.3f}s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Benchmark the changelog generator against synthetic git histories.
+Usage: python benchmark_changelog.py [--sizes 10000,100000,1000000] [--output FILE]
+       python benchmark_changelog.py --compare OLD.json NEW.json
+
+Throwaway repositories are built offline with `git fast-import` and reused
+between runs. Each stage runs in a fresh interpreter so its peak RSS is
+measured in isolation.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+
+import generate_changelog  # noqa: E402
+
+STAGES = ['get_commits', 'categorize', 'generate_changelog', 'all_releases']
+DEFAULT_SIZES = '10000,100000,1000000'
+
+# One tag every this many commits
+TAG_EVERY = 1000
+
+TYPES = ['feat', 'fix', 'docs', 'refactor', 'perf', 'chore', 'deps', 'remove']
+SCOPES = ['core', 'ui', 'cli', 'db', 'auth']
+WORDS = ['parser', 'cache', 'login', 'retry', 'config', 'build', 'api', 'handle',
+         'empty', 'input', 'update', 'legacy', 'flag', 'timeout', 'pipe | char']
+
+
+def build_repo(path, count, seed=0):
+    """Create a repository at `path` with `count` synthetic conventional commits."""
+    rng = random.Random(seed)
+    subprocess.run(['git', 'init', '-q', '-b', 'main', path], check=True)
+    proc = subprocess.Popen(['git', 'fast-import', '--quiet'], cwd=path, stdin=subprocess.PIPE)
+    write = proc.stdin.write
+    timestamp = 1_600_000_000
+    for n in range(1, count + 1):
+        words = ' '.join(rng.choices(WORDS, k=rng.randint(3, 8)))
+        if rng.random() < 0.3:
+            subject = f"{rng.choice(TYPES)}({rng.choice(SCOPES)}): {words}"
+        elif rng.random() < 0.9:
+            subject = f"{rng.choice(TYPES)}: {words}"
+        else:
+            subject = words.capitalize()
+        message = subject.encode()
+        write(b'commit refs/heads/main\n')
+        write(f'mark :{n}\n'.encode())
+        write(f'committer Bench <bench@example.com> {timestamp + n * 60} +0000\n'.encode())
+        write(f'data {len(message)}\n'.encode() + message + b'\n')
+        if n % TAG_EVERY == 0:
+            write(f'reset refs/tags/v{n // TAG_EVERY}.0.0\nfrom :{n}\n\n'.encode())
+    proc.stdin.close()
+    if proc.wait() != 0:
+        raise RuntimeError(f'git fast-import failed for {path}')
+    subprocess.run(['git', 'symbolic-ref', 'HEAD', 'refs/heads/main'], cwd=path, check=True)
+
+
+def ensure_repo(workdir, count):
+    """Return the path of a synthetic repository with `count` commits, building it once."""
+    path = os.path.join(workdir, f'history-{count}')
+    if not os.path.exists(os.path.join(path, '.git', 'refs', 'heads', 'main')):
+        print(f"Building {count:,}-commit repository in {path}...", file=sys.stderr)
+        start = time.perf_counter()
+        build_repo(path, count)
+        print(f"  built in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+    return path
+
+
+def run_stage(stage, repo):
+    """Run one stage in the current process and return its measurements."""
+    os.chdir(repo)
+    items = 0
+    if stage == 'categorize':
+        # Only the classification is timed; reading messages is setup
+        messages = [c['message'] for c in generate_changelog.get_commits()]
+        start = time.perf_counter()
+        items = len(generate_changelog.CLASSIFIER.classify_many(messages))
+    else:
+        start = time.perf_counter()
+        if stage == 'get_commits':
+            lines = generate_changelog.get_commits()
+        elif stage == 'generate_changelog':
+            lines = generate_changelog.iter_changelog(generate_changelog.get_commits())
+        elif stage == 'all_releases':
+            lines = generate_changelog.iter_repo_changelog(all_releases=True)
+        else:
+            raise ValueError(f'unknown stage: {stage}')
+        for _ in lines:
+            items += 1
+    seconds = time.perf_counter() - start
+    return {
+        'stage': stage,
+        'seconds': seconds,
+        'items': items,
+        'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        'git_peak_rss_kb': resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    }
+
+
+def measure(stage, repo):
+    """Run a stage in a fresh interpreter so peak memory is not shared between stages."""
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--run-stage', stage, '--repo', repo],
+        capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f'{stage} failed: {result.stderr.strip()}')
+    return json.loads(result.stdout)
+
+
+def git_version():
+    result = subprocess.run(['git', '--version'], capture_output=True, text=True)
+    return result.stdout.strip()
+
+
+def compare(old_path, new_path):
+    """Print per-stage time and memory ratios between two reports."""
+    with open(old_path, encoding='utf-8') as f:
+        old = {(r['commits'], r['stage']): r for r in json.load(f)['results']}
+    with open(new_path, encoding='utf-8') as f:
+        new = json.load(f)['results']
+    print(f"{'commits':>10} {'stage':<20} {'time':>10} {'peak rss':>10}")
+    for result in new:
+        before = old.get((result['commits'], result['stage']))
+        if before is None:
+            continue
+        time_ratio = result['seconds'] / before['seconds'] if before['seconds'] else float('nan')
+        rss_ratio = result['peak_rss_kb'] / before['peak_rss_kb'] if before['peak_rss_kb'] else float('nan')
+        print(f"{result['commits']:>10,} {result['stage']:<20} {time_ratio:>9.2f}x {rss_ratio:>9.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark changelog generation on synthetic histories')
+    parser.add_argument('--sizes', default=DEFAULT_SIZES,
+                        help=f'Comma-separated commit counts (default: {DEFAULT_SIZES})')
+    parser.add_argument('--stages', default=','.join(STAGES),
+                        help='Comma-separated stages to run')
+    parser.add_argument('--workdir', default=os.path.join(tempfile.gettempdir(), 'changelog-bench'),
+                        help='Where synthetic repositories are built and cached')
+    parser.add_argument('--output', metavar='FILE', help='Write the JSON report here instead of stdout')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'),
+                        help='Compare two JSON reports instead of running')
+    parser.add_argument('--run-stage', help=argparse.SUPPRESS)
+    parser.add_argument('--repo', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_stage:
+        json.dump(run_stage(args.run_stage, args.repo), sys.stdout)
+        return
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    os.makedirs(args.workdir, exist_ok=True)
+    results = []
+    for count in (int(size) for size in args.sizes.split(',')):
+        repo = ensure_repo(args.workdir, count)
+        for stage in args.stages.split(','):
+            result = measure(stage, repo)
+            result['commits'] = count
+            results.append(result)
+            print(f"{count:>10,} {stage:<20} {result['seconds']:>8.2f}s "
+                  f"{result['peak_rss_kb'] / 1024:>8.1f} MiB", file=sys.stderr)
+
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'python': platform.python_version(),
+        'git': git_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == '__main__':
+    main()
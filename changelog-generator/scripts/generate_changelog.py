@@ -2,13 +2,25 @@
 """
 Generate changelog from git commit history.
 Usage: python generate_changelog.py [--since TAG] [--version VERSION]
+       python generate_changelog.py --update CHANGELOG.md [--cache PATH]
+       python generate_changelog.py --all-releases
+       python generate_changelog.py --repos PATH... | --manifest FILE [--output-dir DIR]
 """
 
+import contextlib
+import itertools
+import json
+import os
+import sqlite3
 import subprocess
 import re
 import sys
+import tempfile
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from collections import defaultdict
 
 # Commit type to changelog category mapping
 CATEGORY_MAP = {
@@ -31,69 +43,846 @@ CATEGORY_MAP = {
 
 CATEGORY_ORDER = ['Added', 'Changed', 'Deprecated', 'Removed', 'Fixed', 'Security']
 
+# git log fields, separated (like the records themselves, under -z) by NUL
+LOG_FORMAT = '%H%x00%s%x00%an%x00%ai'
+LOG_FIELDS = 4
 
-def get_commits(since_tag=None):
-    """Get git commits, optionally since a specific tag."""
-    if since_tag:
-        cmd = ['git', 'log', f'{since_tag}..HEAD', '--pretty=format:%H|%s|%an|%ai']
-    else:
-        cmd = ['git', 'log', '--pretty=format:%H|%s|%an|%ai']
+TAG_PREFIX = 'refs/tags/'
+
+READ_CHUNK_SIZE = 64 * 1024
+
+CLASSIFY_BATCH_SIZE = 1024
+
+# Commit objects requested from `git cat-file --batch` per round trip
+METADATA_WINDOW = 256
+
+TRAILER_RE = re.compile(r'^([A-Za-z0-9][A-Za-z0-9-]*):\s*(.+)$')
+PR_TRAILERS = {'pr', 'pr-url', 'pull-request', 'reviewed-on'}
+# `Subject (#123)` as written by squash merges, or `Merge pull request #123`
+PR_SUBJECT_RE = re.compile(r'\(#(\d+)\)\s*$|^Merge pull request #(\d+)')
+
+# Default upper bound on repositories processed concurrently
+MAX_JOBS = 8
+
+# Per-category entries beyond this many bytes are spooled to a temporary file
+SPOOL_MAX_SIZE = 1024 * 1024
+
+
+class GitError(RuntimeError):
+    """A git command needed for the changelog failed."""
+
+
+class Tracer:
+    """Record timing spans for phases and git processes (`--profile`).
+
+    Spans are kept as Chrome trace events, so the output opens directly in
+    chrome://tracing or Perfetto; the summary totals them per phase and per
+    command. Recording is off until `enabled` is set.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.origin = time.perf_counter()
+        self.events = []
+        self.lanes = {}
+        self.lock = threading.Lock()
+
+    def add(self, name, cat, start, end, lane=None, **args):
+        if not self.enabled:
+            return
+        with self.lock:
+            tid = self.lanes.setdefault(lane, len(self.lanes) + 1) if lane else threading.get_ident()
+            self.events.append({
+                'name': name, 'cat': cat, 'ph': 'X', 'pid': os.getpid(), 'tid': tid,
+                'ts': round((start - self.origin) * 1e6), 'dur': round((end - start) * 1e6),
+                'args': args,
+            })
+
+    def process(self, cmd, start, returncode, bytes_read, cwd=None):
+        self.add(' '.join(cmd[:3]), 'process', start, time.perf_counter(), lane=cwd,
+                 argv=' '.join(cmd)[:200], returncode=returncode, bytes_read=bytes_read)
+
+    @contextlib.contextmanager
+    def phase(self, name, lane=None):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, 'phase', start, time.perf_counter(), lane=lane)
+
+    def summary(self):
+        phases, commands = {}, {}
+        for event in self.events:
+            seconds = event['dur'] / 1e6
+            if event['cat'] == 'phase':
+                phases[event['name']] = phases.get(event['name'], 0.0) + seconds
+            else:
+                entry = commands.setdefault(event['name'], {'count': 0, 'seconds': 0.0, 'bytes_read': 0})
+                entry['count'] += 1
+                entry['seconds'] += seconds
+                entry['bytes_read'] += event['args'].get('bytes_read', 0)
+        processes = [e for e in self.events if e['cat'] == 'process']
+        return {
+            'phases': {name: round(seconds, 6) for name, seconds in phases.items()},
+            'commands': {name: dict(entry, seconds=round(entry['seconds'], 6)) for name, entry in commands.items()},
+            'processes': len(processes),
+            'bytes_read': sum(e['args']['bytes_read'] for e in processes),
+        }
 
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    def write(self, path, fmt='chrome'):
+        if fmt == 'chrome':
+            data = {'traceEvents': self.events, 'displayTimeUnit': 'ms', 'otherData': self.summary()}
+        else:
+            data = {'summary': self.summary(), 'events': self.events}
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=1)
+
+
+TRACER = Tracer()
+
+
+class CountingReader:
+    """Wrap a binary stream and count the bytes read through it."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        data = self.stream.read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+def read_records(stream, fields, chunk_size=READ_CHUNK_SIZE):
+    """Yield tuples of `fields` NUL-separated values read incrementally from a byte stream."""
+    record = []
+    tail = b''
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        tokens = (tail + chunk).split(b'\0')
+        tail = tokens.pop()
+        for token in tokens:
+            record.append(token.decode('utf-8', 'replace'))
+            if len(record) == fields:
+                yield tuple(record)
+                record = []
+    if tail or record:
+        record.append(tail.decode('utf-8', 'replace'))
+    if len(record) == fields:
+        yield tuple(record)
+
+
+def run_git(*args, cwd=None):
+    """Run a git command and return its stripped stdout, or None on failure."""
+    start = time.perf_counter()
+    result = subprocess.run(['git', *args], capture_output=True, text=True, cwd=cwd)
+    TRACER.process(['git', *args], start, result.returncode,
+                   len(result.stdout) + len(result.stderr), cwd)
     if result.returncode != 0:
-        print(f"Error: {result.stderr}", file=sys.stderr)
-        return []
-
-    commits = []
-    for line in result.stdout.strip().split('\n'):
-        if line:
-            parts = line.split('|', 3)
-            if len(parts) == 4:
-                commits.append({
-                    'hash': parts[0][:8],
-                    'message': parts[1],
-                    'author': parts[2],
-                    'date': parts[3][:10]
-                })
-    return commits
+        return None
+    return result.stdout.strip()
+
+
+def get_commits(since_tag=None, rev_range=None, with_tags=False, cwd=None):
+    """Lazily yield git commits, optionally since a specific tag.
+
+    Commits are streamed from a single `git log -z` process using NUL-separated
+    fields, so memory stays flat regardless of history length and subjects may
+    contain any character. `rev_range` overrides `since_tag` with an explicit
+    revision range. With `with_tags`, each commit also carries the names of
+    the tags pointing at it, read from the same process via decorations,
+    and commits come in topological order so each release stays contiguous.
+    `cwd` selects the repository (default: the current directory). Raises
+    GitError if `git log` fails, unless the repository has no commits yet.
+    """
+    log_format, fields = LOG_FORMAT, LOG_FIELDS
+    cmd = ['git', 'log', '-z']
+    if with_tags:
+        log_format, fields = log_format + '%x00%D', fields + 1
+        # Date order interleaves merged branches with older releases
+        cmd += ['--topo-order', '--decorate=full', f'--decorate-refs={TAG_PREFIX}']
+    cmd.append(f'--pretty=format:{log_format}')
+    if rev_range:
+        cmd.append(rev_range)
+    elif since_tag:
+        cmd.append(f'{since_tag}..HEAD')
+
+    start = time.perf_counter()
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, cwd=cwd)
+    stdout = CountingReader(proc.stdout)
+    try:
+        for record in read_records(stdout, fields):
+            sha, subject, author, date = record[:LOG_FIELDS]
+            commit = {
+                'sha': sha,
+                'hash': sha[:8],
+                'message': subject,
+                'author': author,
+                'date': date[:10]
+            }
+            if with_tags:
+                commit['tags'] = [ref[len('tag: ' + TAG_PREFIX):]
+                                  for ref in record[LOG_FIELDS].split(', ')
+                                  if ref.startswith('tag: ' + TAG_PREFIX)]
+            yield commit
+    finally:
+        proc.stdout.close()
+        if proc.poll() is None:
+            proc.terminate()
+        stderr = proc.stderr.read().decode('utf-8', 'replace')
+        proc.stderr.close()
+        proc.wait()
+        TRACER.process(cmd, start, proc.returncode, stdout.bytes_read, cwd)
+        # A freshly initialized repository has a git dir but no HEAD yet
+        if proc.returncode > 0 and (run_git('rev-parse', '--verify', '--quiet', 'HEAD', cwd=cwd)
+                                    or run_git('rev-parse', '--git-dir', cwd=cwd) is None):
+            raise GitError(stderr.strip() or f"git log exited with status {proc.returncode}")
+
+
+def get_tag_dates(cwd=None):
+    """Map tag names to their dates: tagger date if annotated, else commit date."""
+    output = run_git('for-each-ref', TAG_PREFIX,
+                     '--format=%(refname:strip=2)%00%(creatordate:short)', cwd=cwd)
+    dates = {}
+    for line in (output or '').splitlines():
+        name, _, date = line.partition('\0')
+        dates[name] = date
+    return dates
+
+
+def version_from_tag(tag):
+    """Turn a tag like `v1.2.0` into the changelog version `1.2.0`."""
+    if re.match(r'^v\d', tag):
+        return tag[1:]
+    return tag
+
+
+class CommitMetadataReader:
+    """Read raw commit objects through one long-lived `git cat-file --batch` process.
+
+    Requests are written in windows and their responses read back in order,
+    so a whole run costs a single extra process instead of one `git show` per
+    commit.
+    """
+
+    def __init__(self, window=METADATA_WINDOW, cwd=None):
+        self.window = window
+        self.cwd = cwd
+        self.bytes_read = 0
+        self.start = time.perf_counter()
+        self.proc = subprocess.Popen(['git', 'cat-file', '--batch'],
+                                     stdin=subprocess.PIPE, stdout=subprocess.PIPE, cwd=cwd)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self.proc.poll() is None:
+            self.proc.stdin.close()
+            self.proc.wait()
+            TRACER.process(self.proc.args, self.start, self.proc.returncode, self.bytes_read, self.cwd)
+        self.proc.stdout.close()
+
+    def read_objects(self, shas):
+        """Return the raw contents of `shas` in order (None for missing objects)."""
+        # A window of 40-byte hashes fits in the pipe buffer, so writing all of
+        # them before reading cannot deadlock against cat-file's output.
+        self.proc.stdin.write(''.join(f"{sha}\n" for sha in shas).encode())
+        self.proc.stdin.flush()
+        objects = []
+        for _ in shas:
+            header = self.proc.stdout.readline().split()
+            if len(header) != 3:
+                objects.append(None)
+                continue
+            size = int(header[2])
+            self.bytes_read += size
+            objects.append(self.proc.stdout.read(size))
+            self.proc.stdout.read(1)
+        return objects
+
+    def enrich(self, commits):
+        """Yield commits with `body`, `trailers`, `co_authors` and `pr` filled in."""
+        commits = iter(commits)
+        while True:
+            batch = list(itertools.islice(commits, self.window))
+            if not batch:
+                return
+            for commit, raw in zip(batch, self.read_objects([c['sha'] for c in batch])):
+                if raw is not None:
+                    commit.update(parse_commit_object(raw))
+                yield commit
+
+
+def parse_commit_object(raw):
+    """Parse a raw commit object into body, trailers, co-authors and PR number."""
+    headers, _, message = raw.decode('utf-8', 'replace').partition('\n\n')
+    subject, _, body = message.strip('\n').partition('\n')
+    body = body.strip('\n')
+
+    trailers = []
+    paragraphs = body.split('\n\n')
+    last = paragraphs[-1].splitlines() if body else []
+    if last and all(TRAILER_RE.match(line) for line in last):
+        trailers = [TRAILER_RE.match(line).groups() for line in last]
+        body = '\n\n'.join(paragraphs[:-1])
+
+    pr = None
+    for key, value in trailers:
+        if key.lower() in PR_TRAILERS:
+            number = re.search(r'(\d+)\D*$', value)
+            pr = number.group(1) if number else None
+    if pr is None:
+        number = PR_SUBJECT_RE.search(subject)
+        pr = number.group(1) or number.group(2) if number else None
+
+    return {
+        'body': body,
+        'trailers': trailers,
+        'co_authors': [value for key, value in trailers if key.lower() == 'co-authored-by'],
+        'parents': [line[7:] for line in headers.splitlines() if line.startswith('parent ')],
+        'pr': pr,
+    }
+
+
+Classification = namedtuple('Classification', 'category description scope breaking')
+
+
+class CommitClassifier:
+    """Rule-table commit classifier compiled once from CATEGORY_MAP or a rules file.
+
+    A single anchored regex matches literal team prefixes (e.g. `[sec]`) and
+    the conventional `type(scope)!:` header; messages with a body are also
+    checked for a `BREAKING CHANGE:` footer. Types are looked up
+    case-insensitively; anything unmatched falls into the default category.
+    """
+
+    def __init__(self, types=None, prefixes=None, default='Changed', order=None,
+                 breaking_label='**BREAKING:** '):
+        self.types = {k.lower(): v for k, v in (types or CATEGORY_MAP).items()}
+        self.prefixes = {k.lower(): v for k, v in (prefixes or {}).items()}
+        self.default = default
+        self.order = list(order or CATEGORY_ORDER)
+        for category in [default, *self.types.values(), *self.prefixes.values()]:
+            if category not in self.order:
+                self.order.append(category)
+        self.breaking_label = breaking_label
+        self._seen = {}
+
+        # Longest prefixes first so that e.g. `[security]` wins over `[sec`;
+        # `(?!)` never matches and keeps the group layout fixed without prefixes
+        alternation = '|'.join(
+            re.escape(p) for p in sorted(self.prefixes, key=len, reverse=True)) or '(?!)'
+        self._match = re.compile(
+            rf'(?:(?P<prefix>{alternation})(?!\w)[ \t]*:?[ \t]*'
+            r'|(?P<type>\w+)(?:\((?P<scope>[^)\n]+)\))?(?P<bang>!)?:[ \t]*)'
+            r'(?=[^\n])',
+            re.IGNORECASE,
+        ).match
+        self._footer = re.compile(r'^BREAKING[ -]CHANGE:', re.MULTILINE).search
+
+    @classmethod
+    def from_file(cls, path):
+        """Load a classifier from a JSON rules file.
+
+        Recognized keys: `types` (merged over CATEGORY_MAP), `prefixes`,
+        `default`, `order` and `breaking_label`.
+        """
+        with open(path, encoding='utf-8') as f:
+            rules = json.load(f)
+        types = dict(CATEGORY_MAP)
+        types.update(rules.get('types', {}))
+        return cls(
+            types=types,
+            prefixes=rules.get('prefixes'),
+            default=rules.get('default', 'Changed'),
+            order=rules.get('order'),
+            breaking_label=rules.get('breaking_label', '**BREAKING:** '),
+        )
+
+    def _category(self, keyword):
+        """Resolve a matched prefix or type, memoizing by its exact spelling."""
+        category = self._seen.get(keyword)
+        if category is None:
+            lowered = keyword.lower()
+            category = self.prefixes.get(lowered) or self.types.get(lowered, self.default)
+            self._seen[keyword] = category
+        return category
+
+    def classify(self, message):
+        """Classify one commit message."""
+        return Classification._make(self.classify_many((message,))[0])
+
+    def classify_many(self, messages):
+        """Classify a batch of commit messages, preserving order.
+
+        Returns plain `(category, description, scope, breaking)` tuples, in the
+        field order of `Classification`, to keep the hot loop allocation-light.
+        """
+        match, footer, seen, category_of = self._match, self._footer, self._seen, self._category
+        default, label = self.default, self.breaking_label
+        results = []
+        append = results.append
+        for message in messages:
+            m = match(message)
+            if m is None:
+                start, category, scope, bang = 0, default, None, None
+            else:
+                prefix, commit_type, scope, bang = m.groups()
+                keyword = prefix or commit_type
+                category = seen.get(keyword) or category_of(keyword)
+                start = m.end()
+            if '\n' in message:
+                # Only messages with a body can carry a footer
+                end = message.index('\n')
+                description = message[start:end]
+                breaking = bool(bang or footer(message, end))
+            else:
+                description = message[start:] if start else message
+                breaking = bool(bang)
+            if breaking:
+                description = label + description
+            append((category, description, scope, breaking))
+        return results
+
+
+CLASSIFIER = CommitClassifier()
+
+
+def load_rules(path):
+    """Replace the module classifier with one loaded from a JSON rules file."""
+    global CLASSIFIER
+    CLASSIFIER = CommitClassifier.from_file(path)
+    return CLASSIFIER
 
 
 def categorize_commit(message):
     """Categorize a commit message by its prefix."""
-    # Match conventional commit format: type(scope): message or type: message
-    match = re.match(r'^(\w+)(?:\([^)]+\))?:\s*(.+)$', message, re.IGNORECASE)
-    if match:
-        commit_type = match.group(1).lower()
-        description = match.group(2)
-        category = CATEGORY_MAP.get(commit_type, 'Changed')
-        return category, description
+    category, description, _, _ = CLASSIFIER.classify_many((message,))[0]
+    return category, description
+
+
+def full_message(commit):
+    """Rebuild a commit's message from its subject, body and trailers.
+
+    Trailers are split off the body by `parse_commit_object()`, but a
+    `BREAKING-CHANGE:` trailer still has to reach the classifier.
+    """
+    parts = [commit['message']]
+    if commit.get('body'):
+        parts.append(commit['body'])
+    if commit.get('trailers'):
+        parts.append('\n'.join(f'{key}: {value}' for key, value in commit['trailers']))
+    return '\n\n'.join(parts)
+
+
+def classify_commits(commits, batch_size=CLASSIFY_BATCH_SIZE):
+    """Yield `(commit, (category, description, scope, breaking))` pairs.
+
+    Commits are pulled from the iterable in small batches and classified with
+    `CommitClassifier.classify_many()`, so streaming input stays streaming.
+    """
+    commits = iter(commits)
+    while True:
+        batch = list(itertools.islice(commits, batch_size))
+        if not batch:
+            return
+        messages = [full_message(c) for c in batch]
+        start = time.perf_counter()
+        results = CLASSIFIER.classify_many(messages)
+        TRACER.add('classify', 'phase', start, time.perf_counter(), commits=len(batch))
+        yield from zip(batch, results)
+
 
-    # No prefix found, categorize as Changed
-    return 'Changed', message
+def iter_changelog(commits, version='Unreleased', date=None, group_by='category'):
+    """Yield changelog markdown lines from an iterable of commits.
 
+    The release header is yielded before `commits` is consumed. Entries are
+    bucketed per category into spooled temporary files, so arbitrarily long
+    histories do not have to be held in memory. `date` defaults to today for
+    released versions. With `group_by` set to 'scope' or 'pr', entries within
+    each category are further grouped under `####` headings.
+    """
+    date_str = date or (datetime.now().strftime('%Y-%m-%d') if version != 'Unreleased' else '')
+    yield f"## [{version}]" + (f" - {date_str}" if date_str else "")
+    yield ""
 
-def generate_changelog(commits, version='Unreleased'):
+    buckets = {}
+    try:
+        for commit, (category, description, scope, _) in classify_commits(commits):
+            pr = commit.get('pr')
+            if group_by == 'scope':
+                group = scope or ''
+            elif group_by == 'pr':
+                group = f"#{pr}" if pr else ''
+            else:
+                group = ''
+            if pr and group_by != 'pr' and f"#{pr}" not in description:
+                description = f"{description} (#{pr})"
+            bucket = buckets.get((category, group))
+            if bucket is None:
+                bucket = buckets[(category, group)] = tempfile.SpooledTemporaryFile(
+                    max_size=SPOOL_MAX_SIZE, mode='w+', encoding='utf-8')
+            bucket.write(f"- {description}\n")
+
+        categories = list(dict.fromkeys(category for category, _ in buckets))
+        order = CLASSIFIER.order + [c for c in categories if c not in CLASSIFIER.order]
+        for category in order:
+            # Ungrouped entries first, then groups in order of first appearance
+            groups = sorted((g for c, g in buckets if c == category), key=bool)
+            if not groups:
+                continue
+            yield f"### {category}"
+            for group in groups:
+                bucket = buckets[(category, group)]
+                bucket.seek(0)
+                if group:
+                    yield f"#### {group}"
+                for line in bucket:
+                    yield line.rstrip('\n')
+            yield ""
+    finally:
+        for bucket in buckets.values():
+            bucket.close()
+
+
+def generate_changelog(commits, version='Unreleased', date=None, group_by='category'):
     """Generate changelog markdown from commits."""
-    categorized = defaultdict(list)
+    return '\n'.join(iter_changelog(commits, version, date, group_by))
+
+
+def iter_releases(commits, tag_dates, group_by='category'):
+    """Yield changelog lines for every release from one newest-first commit stream.
+
+    `commits` must come from `get_commits(with_tags=True)`. A new section
+    starts at each tagged commit; commits above the newest tag go to
+    [Unreleased]. Sections are emitted as soon as their boundary is reached.
+    Splitting follows `git log --topo-order`, which lists each merged branch
+    next to its merge commit. A branch merged after a tag therefore lands in
+    the later release, even if its commits are older than the tag.
+    """
+    current = ['Unreleased']
+
+    def release_of(commit):
+        if commit['tags']:
+            current[0] = commit['tags'][0]
+        return current[0]
+
+    for tag, group in itertools.groupby(commits, key=release_of):
+        if tag == 'Unreleased':
+            yield from iter_changelog(group, group_by=group_by)
+        else:
+            yield from iter_changelog(group, version_from_tag(tag), tag_dates.get(tag, ''),
+                                      group_by)
+
+
+class ChangelogCache:
+    """On-disk SQLite cache of categorized commits keyed by hash.
+
+    Also records the last HEAD that was processed, so reruns only need to walk
+    `last_head..HEAD`. Rows are numbered in insertion order; everything inserted
+    since `mark()` can be read back per category without holding it in memory.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS commits (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                hash TEXT UNIQUE NOT NULL,
+                category TEXT NOT NULL,
+                description TEXT NOT NULL,
+                author TEXT,
+                date TEXT
+            );
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+        """)
+
+    def close(self):
+        self.conn.close()
+
+    @property
+    def last_head(self):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'last_head'").fetchone()
+        return row[0] if row else None
+
+    @last_head.setter
+    def last_head(self, sha):
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('last_head', ?)", (sha,))
+
+    def mark(self):
+        """Return a marker for rows inserted after this call."""
+        row = self.conn.execute("SELECT MAX(seq) FROM commits").fetchone()
+        return row[0] or 0
+
+    def add(self, commits, batch_size=1000):
+        """Categorize and store commits not yet cached. Returns the number added."""
+        before = self.conn.total_changes
+        rows = (
+            (c['sha'], category, description, c['author'], c['date'])
+            for c, (category, description, _, _) in classify_commits(commits)
+        )
+        insert = ("INSERT OR IGNORE INTO commits (hash, category, description, author, date) "
+                  "VALUES (?, ?, ?, ?, ?)")
+        while True:
+            batch = list(itertools.islice(rows, batch_size))
+            if not batch:
+                break
+            self.conn.executemany(insert, batch)
+        return self.conn.total_changes - before
+
+    def entries_since(self, marker, category):
+        """Yield descriptions in `category` inserted after `marker`, in git log order."""
+        cursor = self.conn.execute(
+            "SELECT description FROM commits WHERE seq > ? AND category = ? ORDER BY seq",
+            (marker, category))
+        for (description,) in cursor:
+            yield description
+
+
+def default_cache_path():
+    """Place the cache inside the repository's git directory."""
+    git_dir = run_git('rev-parse', '--git-dir') or '.git'
+    return os.path.join(git_dir, 'changelog-cache.sqlite')
+
+
+def update_unreleased(path, new_entries):
+    """Merge new entries into the [Unreleased] section of a changelog file in place.
+
+    `new_entries(category)` yields the descriptions to prepend to that category.
+    Only the [Unreleased] section is rewritten, keeping any text above its
+    first category; the rest of the file is copied through unchanged. The section is created if it does not exist yet.
+    """
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            lines = f.read().split('\n')
+    else:
+        lines = ['# Changelog', '']
 
-    for commit in commits:
-        category, description = categorize_commit(commit['message'])
-        categorized[category].append(description)
+    start = next((i for i, line in enumerate(lines)
+                  if line.strip().lower() == '## [unreleased]'), None)
+    if start is None:
+        # Insert before the first release, or after the title
+        start = next((i for i, line in enumerate(lines) if line.startswith('## ')), None)
+        if start is None:
+            while lines and not lines[-1].strip():
+                lines.pop()
+            lines.append('')
+            start = len(lines)
+        end = start
+    else:
+        end = next((i for i in range(start + 1, len(lines)) if lines[i].startswith('## ')),
+                   len(lines))
+
+    # Existing bullets per category, keeping any categories we don't know about,
+    # and any prose between the section heading and its first category
+    existing = {}
+    preamble = []
+    category = None
+    for line in lines[start + 1:end]:
+        if line.startswith('### '):
+            category = line[4:].strip()
+            existing.setdefault(category, [])
+        elif category is None:
+            preamble.append(line)
+        elif line.strip():
+            existing[category].append(line)
+    while preamble and not preamble[-1].strip():
+        preamble.pop()
+    while preamble and not preamble[0].strip():
+        preamble.pop(0)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=directory,
+                                     delete=False) as out:
+        out.write('\n'.join(lines[:start]))
+        out.write('\n' if start else '')
+        out.write('## [Unreleased]\n\n')
+        if preamble:
+            out.write('\n'.join(preamble) + '\n\n')
+        categories = CLASSIFIER.order + [c for c in existing if c not in CLASSIFIER.order]
+        for category in categories:
+            bullets = itertools.chain(
+                (f"- {description}" for description in new_entries(category)),
+                existing.get(category, ()))
+            first = next(bullets, None)
+            if first is None:
+                continue
+            out.write(f"### {category}\n{first}\n")
+            for bullet in bullets:
+                out.write(f"{bullet}\n")
+            out.write('\n')
+        out.write('\n'.join(lines[end:]))
+    os.replace(out.name, path)
+
+
+def update_changelog(path, cache, since_tag=None):
+    """Incrementally update the [Unreleased] section of `path` from the cache.
+
+    Only commits in `last_head..HEAD` are walked and classified. If the cached
+    head is unknown or no longer an ancestor of HEAD (e.g. after a rebase),
+    commits since `since_tag` (default: the latest tag reachable from HEAD)
+    are walked instead, skipping hashes that are already cached, so released
+    commits never land in [Unreleased].
+    Returns the number of new commits.
+    """
+    head = run_git('rev-parse', 'HEAD')
+    if head is None:
+        print("Error: cannot resolve HEAD", file=sys.stderr)
+        return 0
+
+    last_head = cache.last_head
+    if last_head == head:
+        return 0
+    if last_head and run_git('merge-base', '--is-ancestor', last_head, head) is not None:
+        rev_range = f'{last_head}..{head}'
+    else:
+        since_tag = since_tag or run_git('describe', '--tags', '--abbrev=0', head)
+        rev_range = f'{since_tag}..{head}' if since_tag else head
+
+    with cache.conn:
+        marker = cache.mark()
+        added = cache.add(get_commits(rev_range=rev_range))
+        if added:
+            update_unreleased(path, lambda category: cache.entries_since(marker, category))
+        cache.last_head = head
+    return added
+
+
+def iter_repo_changelog(cwd=None, since_tag=None, version='Unreleased', all_releases=False,
+                        metadata=False, group_by='category'):
+    """Yield the changelog lines for one repository; nothing if it has no commits."""
+    with contextlib.ExitStack() as stack:
+        commits = get_commits(since_tag, with_tags=all_releases, cwd=cwd)
+        if metadata or group_by == 'pr':
+            reader = stack.enter_context(CommitMetadataReader(cwd=cwd))
+            commits = reader.enrich(commits)
+
+        first = next(commits, None)
+        if first is None:
+            return
+        commits = itertools.chain([first], commits)
+
+        if all_releases:
+            yield "# Changelog"
+            yield ""
+            yield from iter_releases(commits, get_tag_dates(cwd), group_by)
+        else:
+            yield from iter_changelog(commits, version, group_by=group_by)
+
+
+def read_manifest(path):
+    """Read repository paths from a manifest, one per line; `#` starts a comment.
+
+    Relative paths are resolved against the manifest's directory.
+    """
+    base = os.path.dirname(os.path.abspath(path))
+    repos = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if line:
+                repos.append(os.path.join(base, line))
+    return repos
 
-    lines = []
-    date_str = datetime.now().strftime('%Y-%m-%d') if version != 'Unreleased' else ''
-    header = f"## [{version}]" + (f" - {date_str}" if date_str else "")
-    lines.append(header)
-    lines.append("")
 
-    for category in CATEGORY_ORDER:
-        if category in categorized:
-            lines.append(f"### {category}")
-            for desc in categorized[category]:
-                lines.append(f"- {desc}")
-            lines.append("")
+def list_submodules(repo):
+    """Return the paths of the initialized submodules of `repo`, recursively."""
+    output = run_git('submodule', 'foreach', '--quiet', '--recursive',
+                     'echo "$displaypath"', cwd=repo)
+    return [os.path.join(repo, path) for path in (output or '').splitlines() if path]
 
-    return '\n'.join(lines)
+
+def write_repo_changelog(repo, path, **options):
+    """Write one repository's changelog to `path` and return summary stats."""
+    stats = {'repo': repo, 'output': path, 'commits': 0, 'categories': {}}
+    start = time.perf_counter()
+    category = None
+    try:
+        with open(path, 'w', encoding='utf-8') as out:
+            for line in iter_repo_changelog(repo, **options):
+                out.write(line + '\n')
+                if line.startswith('### '):
+                    category = line[4:]
+                elif line.startswith('- ') and category:
+                    stats['commits'] += 1
+                    stats['categories'][category] = stats['categories'].get(category, 0) + 1
+    except Exception:
+        os.remove(path)
+        raise
+    stats['seconds'] = time.perf_counter() - start
+    TRACER.add(repo, 'phase', start, start + stats['seconds'], lane=repo, commits=stats['commits'])
+    return stats
+
+
+def generate_many(repos, output_dir, jobs=None, **options):
+    """Generate changelogs for many repositories concurrently.
+
+    Each repository's `git log` and categorization runs on a bounded thread
+    pool, so total wall time tracks the slowest repository rather than the
+    sum. Writes `<name>.md` per repository plus `SUMMARY.md`, and returns the
+    per-repository stats in input order; a failed repository gets no `.md`
+    and an `error` in its stats.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    names = {}
+    for repo in repos:
+        name = os.path.basename(os.path.abspath(repo)) or 'repo'
+        unique, n = name, 1
+        while unique in names.values():
+            n += 1
+            unique = f'{name}-{n}'
+        names[repo] = unique
+
+    with ThreadPoolExecutor(max_workers=jobs or min(MAX_JOBS, len(repos)) or 1) as pool:
+        futures = {
+            repo: pool.submit(write_repo_changelog, repo,
+                              os.path.join(output_dir, f'{names[repo]}.md'), **options)
+            for repo in repos
+        }
+        results = []
+        for repo in repos:
+            try:
+                results.append(futures[repo].result())
+            except Exception as e:
+                results.append({'repo': repo, 'output': None, 'commits': 0,
+                                'categories': {}, 'seconds': 0.0, 'error': str(e) or type(e).__name__})
+
+    categories = list(CLASSIFIER.order)
+    for stats in results:
+        categories += [c for c in stats['categories'] if c not in categories]
+    with open(os.path.join(output_dir, 'SUMMARY.md'), 'w', encoding='utf-8') as out:
+        out.write('# Changelog Summary\n\n')
+        out.write('| Repository | Commits | ' + ' | '.join(categories) + ' |\n')
+        out.write('|---|---:|' + '---:|' * len(categories) + '\n')
+        for stats in results:
+            link = (f"[{names[stats['repo']]}]({names[stats['repo']]}.md)" if stats['output']
+                    else f"{names[stats['repo']]} (error: {stats['error'].splitlines()[0]})")
+            counts = ' | '.join(str(stats['categories'].get(c, 0)) for c in categories)
+            out.write(f"| {link} | {stats['commits']} | {counts} |\n")
+    return results
+
+
+def positive_int(value):
+    """Parse an integer of at least 1, e.g. for `--jobs`."""
+    import argparse
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'invalid integer: {value}') from None
+    if number < 1:
+        raise argparse.ArgumentTypeError(f'must be at least 1: {value}')
+    return number
 
 
 def main():
@@ -101,15 +890,106 @@ def main():
     parser = argparse.ArgumentParser(description='Generate changelog from git commits')
     parser.add_argument('--since', help='Generate changelog since this tag')
     parser.add_argument('--version', default='Unreleased', help='Version number for this release')
+    parser.add_argument('--update', metavar='FILE',
+                        help='Incrementally update the [Unreleased] section of this changelog file')
+    parser.add_argument('--cache', metavar='PATH',
+                        help='Commit cache used by --update (default: .git/changelog-cache.sqlite)')
+    parser.add_argument('--all-releases', action='store_true',
+                        help='Emit a section for every tagged release from a single history walk')
+    parser.add_argument('--rules', metavar='FILE', help='JSON rules file for commit classification')
+    parser.add_argument('--metadata', action='store_true',
+                        help='Read commit bodies and trailers (PR numbers, co-authors) via git cat-file')
+    parser.add_argument('--group-by', choices=['category', 'scope', 'pr'], default='category',
+                        help='Group entries within each category by scope or PR (pr implies --metadata)')
+    parser.add_argument('--repos', nargs='+', metavar='PATH',
+                        help='Generate changelogs for several repositories concurrently')
+    parser.add_argument('--manifest', metavar='FILE',
+                        help='File listing repository paths, one per line')
+    parser.add_argument('--submodules', action='store_true',
+                        help='Also include the submodules of each listed repository')
+    parser.add_argument('--output-dir', default='changelogs',
+                        help='Directory for per-repository changelogs and SUMMARY.md')
+    parser.add_argument('-j', '--jobs', type=positive_int,
+                        help=f'Repositories processed in parallel (default: up to {MAX_JOBS})')
+    parser.add_argument('--profile', metavar='FILE',
+                        help='Write per-phase and per-git-process timings to FILE')
+    parser.add_argument('--profile-format', choices=['chrome', 'json'], default='chrome',
+                        help='Profile format: Chrome trace (default) or plain JSON')
     args = parser.parse_args()
 
-    commits = get_commits(args.since)
-    if not commits:
-        print("No commits found.", file=sys.stderr)
-        return
+    if not args.profile:
+        sys.exit(run(args))
+    TRACER.enabled = True
+    try:
+        with TRACER.phase('total'):
+            status = run(args)
+    finally:
+        TRACER.write(args.profile, args.profile_format)
+        summary = TRACER.summary()
+        print(f"Profile written to {args.profile} ({summary['processes']} git processes, "
+              f"{summary['bytes_read']:,} bytes read)", file=sys.stderr)
+    sys.exit(status)
+
+
+def run(args):
+    """Generate or update changelogs as selected by the parsed arguments.
+
+    Returns the process exit status: 1 if git failed for any repository.
+    """
+    if args.rules:
+        load_rules(args.rules)
+
+    if args.update:
+        cache = ChangelogCache(args.cache or default_cache_path())
+        try:
+            with TRACER.phase('update'):
+                added = update_changelog(args.update, cache, args.since)
+        except GitError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        finally:
+            cache.close()
+        print(f"Added {added} commit(s) to [Unreleased] in {args.update}", file=sys.stderr)
+        return 0
+
+    options = {
+        'since_tag': args.since,
+        'version': args.version,
+        'all_releases': args.all_releases,
+        'metadata': args.metadata,
+        'group_by': args.group_by,
+    }
+
+    if args.repos or args.manifest:
+        repos = list(args.repos or [])
+        if args.manifest:
+            repos += read_manifest(args.manifest)
+        if args.submodules:
+            repos += [sub for repo in repos for sub in list_submodules(repo)]
+        results = generate_many(repos, args.output_dir, args.jobs, **options)
+        for stats in results:
+            status = (f"error: {stats['error']}" if 'error' in stats
+                      else f"{stats['commits']} entries in {stats['seconds']:.2f}s")
+            print(f"{stats['repo']}: {status}", file=sys.stderr)
+        print(f"Wrote {os.path.join(args.output_dir, 'SUMMARY.md')}", file=sys.stderr)
+        failed = sum('error' in stats for stats in results)
+        if failed:
+            print(f"Error: {failed} of {len(results)} repositories failed", file=sys.stderr)
+        return 1 if failed else 0
+
+    try:
+        lines = iter_repo_changelog(**options)
+        first = next(lines, None)
+        if first is None:
+            print("No commits found.", file=sys.stderr)
+            return 0
 
-    changelog = generate_changelog(commits, args.version)
-    print(changelog)
+        for line in itertools.chain([first], lines):
+            print(line, flush=True)
+    except GitError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
 
 
 if __name__ == '__main__':
@@ -8,66 +8,282 @@ Usage:
     python git_push.py -b feature/xxx      # Create branch and push
     python git_push.py --pr                # Push and create PR
     python git_push.py --pr --title "xxx"  # Push and create PR with title
+    python git_push.py --repos a b -j 4    # Push several repositories concurrently
 """
 
+import asyncio
+import contextlib
+import functools
 import subprocess
 import sys
 import argparse
+import fnmatch
+import http.client
+import json
+import math
+import os
+import queue
+import random
 import re
-from typing import Optional, Tuple
+import shutil
+import threading
+import time
+import urllib.parse
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
 
+SENSITIVE_NAME_RE = re.compile(r"\.env|\.pem|\.key|password|secret|credential", re.IGNORECASE)
 
-def run_cmd(cmd: str, check: bool = True) -> Tuple[int, str, str]:
-    """Run a shell command and return (returncode, stdout, stderr)."""
-    result = subprocess.run(
+# Content rules over raw blob bytes, each with the literals (lowercased) any
+# match must contain. A rule only runs near hits of its own literals.
+SECRET_RULES = {
+    "private_key": (rb"-----BEGIN (?:[A-Z]+ )?PRIVATE KEY-----", (b"private key",)),
+    "aws_access_key": (rb"\b(?:AKIA|ASIA)[0-9A-Z]{16}\b", (b"akia", b"asia")),
+    "github_token": (rb"\b(?:gh[pousr]_[A-Za-z0-9]{36,}|github_pat_[A-Za-z0-9_]{22,})",
+                     (b"ghp_", b"gho_", b"ghu_", b"ghs_", b"ghr_", b"github_pat_")),
+    "slack_token": (rb"\bxox[abprs]-[A-Za-z0-9-]{10,}", (b"xox",)),
+    "google_api_key": (rb"\bAIza[0-9A-Za-z_-]{35}\b", (b"aiza",)),
+    "api_secret_key": (rb"\bsk-[A-Za-z0-9_-]{20,}", (b"sk-",)),
+}
+SECRET_RES = {rule: re.compile(pattern) for rule, (pattern, _) in SECRET_RULES.items()}
+# Bytes searched around a keyword hit: before it (the literal may sit inside
+# the match, e.g. "PRIVATE KEY") and after it (the rest of the token)
+SECRET_CONTEXT_BEFORE = 32
+SECRET_CONTEXT_AFTER = 512
+
+# `name = value` assignments, matched on the lowercased blob. Each name gets
+# its own pattern starting with that literal, so the regex engine skips
+# straight from one occurrence to the next instead of trying every offset.
+ASSIGNMENT_NAMES = (b"password", b"passwd", b"secret", b"api_key", b"api-key", b"apikey",
+                    b"token", b"access_key", b"access-key", b"accesskey")
+ASSIGNMENT_RES = [re.compile(re.escape(name) + rb"[\"']?\s*[:=]\s*[\"']?(?P<value>[^\s\"',;]{12,})")
+                  for name in ASSIGNMENT_NAMES]
+
+# Generic `secret = value` hits must look random enough to be real credentials
+MIN_SECRET_ENTROPY = 3.5
+MAX_SCAN_FILE_BYTES = 1024 * 1024
+# Same heuristic as git: a NUL byte near the start means binary
+BINARY_SNIFF_BYTES = 8000
+SCAN_WINDOW = 256
+SCAN_PARALLEL_THRESHOLD = 1000
+SCAN_WORKERS = 4
+
+# Blob size defaults follow GitHub: warning at 50 MiB, rejection over 100 MiB
+WARN_BLOB_SIZE = 50 * 1024 * 1024
+MAX_BLOB_SIZE = 100 * 1024 * 1024
+# Git LFS pointer files are tiny; anything bigger on an LFS path is the real content
+LFS_POINTER_MAX_SIZE = 1024
+
+# e.g. "Writing objects:  45% (9/20), 1.20 MiB | 2.40 MiB/s"
+PROGRESS_RE = re.compile(r"^(.+?):\s+(\d+)% \(\d+/\d+\)"
+                         r"(?:, ([\d.]+) (bytes|KiB|MiB|GiB)(?: \| ([\d.]+) (bytes|KiB|MiB|GiB)/s)?)?")
+UNITS = {"bytes": 1, "KiB": 1024, "MiB": 1024 ** 2, "GiB": 1024 ** 3}
+
+GITHUB_API_URL = "https://api.github.com"
+# git@github.com:owner/name.git, https://github.com/owner/name, ssh://git@github.com/owner/name
+GITHUB_REMOTE_RE = re.compile(r"github\.com[:/]([^/]+/[^/]+?)(?:\.git)?/?$")
+HTTP_POOL_SIZE = 8
+HTTP_TIMEOUT = 30.0
+
+# Seconds before the first retry of a network command; doubles on each attempt
+RETRY_BACKOFF = 1.0
+
+NULL_SHA = "0" * 40
+GITLINK_MODE = "160000"
+
+
+class Tracer:
+    """Collects timing spans for phases, subprocesses and HTTP requests.
+
+    Disabled by default; `--profile` turns it on and writes the spans as a
+    Chrome trace (chrome://tracing, Perfetto) or as plain JSON.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.origin = time.perf_counter()
+        self.events: List[dict] = []
+        self.lanes: Dict[str, int] = {}
+        self.lock = threading.Lock()
+
+    def add(self, name: str, category: str, start: float, end: float,
+            lane: Optional[str] = None, **args) -> None:
+        """Record a finished span. `lane` groups concurrent work (e.g. per repository)."""
+        if not self.enabled:
+            return
+        with self.lock:
+            tid = self.lanes.setdefault(lane, len(self.lanes) + 1) if lane else threading.get_ident()
+            self.events.append({
+                "name": name, "cat": category, "ph": "X", "pid": os.getpid(), "tid": tid,
+                "ts": round((start - self.origin) * 1e6), "dur": round((end - start) * 1e6),
+                "args": args
+            })
+
+    def process(self, cmd: Sequence[str], start: float, returncode: Optional[int],
+                bytes_read: int, cwd: Optional[str] = None) -> None:
+        """Record a finished subprocess."""
+        self.add(" ".join(cmd[:3]), "process", start, time.perf_counter(), lane=cwd,
+                 argv=" ".join(cmd)[:200], returncode=returncode, bytes_read=bytes_read)
+
+    @contextlib.contextmanager
+    def phase(self, name: str, lane: Optional[str] = None):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, "phase", start, time.perf_counter(), lane=lane)
+
+    def summary(self) -> dict:
+        """Aggregate totals per phase and per command."""
+        phases: Dict[str, float] = {}
+        commands: Dict[str, dict] = {}
+        for event in self.events:
+            seconds = event["dur"] / 1e6
+            if event["cat"] == "phase":
+                phases[event["name"]] = phases.get(event["name"], 0.0) + seconds
+            else:
+                entry = commands.setdefault(event["name"], {"count": 0, "seconds": 0.0, "bytes_read": 0})
+                entry["count"] += 1
+                entry["seconds"] += seconds
+                entry["bytes_read"] += event["args"].get("bytes_read", 0)
+        processes = [e for e in self.events if e["cat"] == "process"]
+        return {
+            "phases": {name: round(seconds, 6) for name, seconds in phases.items()},
+            "commands": {name: dict(entry, seconds=round(entry["seconds"], 6)) for name, entry in commands.items()},
+            "processes": len(processes),
+            "bytes_read": sum(e["args"]["bytes_read"] for e in processes),
+        }
+
+    def write(self, path: str, fmt: str = "chrome") -> None:
+        if fmt == "chrome":
+            data = {"traceEvents": self.events, "displayTimeUnit": "ms", "otherData": self.summary()}
+        else:
+            data = {"summary": self.summary(), "events": self.events}
+        with open(path, "w") as f:
+            json.dump(data, f, indent=1)
+
+
+TRACER = Tracer()
+
+
+def traced_run(cmd: Sequence[str], **kwargs) -> subprocess.CompletedProcess:
+    """subprocess.run() that records the call with the tracer."""
+    start = time.perf_counter()
+    result = subprocess.run(list(cmd), **kwargs)
+    TRACER.process(cmd, start, result.returncode,
+                   len(result.stdout or "") + len(result.stderr or ""), kwargs.get("cwd"))
+    return result
+
+
+def run_cmd(cmd: Sequence[str], check: bool = True, cwd: Optional[str] = None) -> Tuple[int, str, str]:
+    """Run a command without a shell and return (returncode, stdout, stderr)."""
+    result = traced_run(
         cmd,
-        shell=True,
         capture_output=True,
-        text=True
+        text=True,
+        cwd=cwd
     )
     if check and result.returncode != 0:
         print(f"Error: {result.stderr}", file=sys.stderr)
     return result.returncode, result.stdout.strip(), result.stderr.strip()
 
 
-def get_git_status() -> dict:
-    """Get current git status."""
+def parse_status_v2(output: str) -> dict:
+    """Parse `git status --porcelain=v2 --branch -z` output into a status dict."""
     status = {
         "has_changes": False,
         "staged": [],
         "unstaged": [],
         "untracked": [],
         "branch": "",
-        "remote": ""
+        "remote": "",
+        "head": None,
+        "upstream": None,
+        "ahead": 0,
+        "behind": 0,
+        "numstat": {}
     }
 
-    # Get current branch
-    _, branch, _ = run_cmd("git branch --show-current", check=False)
-    status["branch"] = branch
-
-    # Get remote
-    _, remote, _ = run_cmd("git remote", check=False)
-    status["remote"] = remote.split("\n")[0] if remote else "origin"
-
-    # Get status
-    _, output, _ = run_cmd("git status --porcelain", check=False)
-    if output:
-        status["has_changes"] = True
-        for line in output.split("\n"):
-            if line.startswith("??"):
-                status["untracked"].append(line[3:])
-            elif line[0] != " ":
-                status["staged"].append(line[3:])
+    records = iter(output.split("\0"))
+    for record in records:
+        if record.startswith("# "):
+            key, _, value = record[2:].partition(" ")
+            if key == "branch.oid":
+                status["head"] = None if value == "(initial)" else value
+            elif key == "branch.head":
+                status["branch"] = "" if value == "(detached)" else value
+            elif key == "branch.upstream":
+                status["upstream"] = value
+            elif key == "branch.ab":
+                ahead, behind = value.split()
+                status["ahead"], status["behind"] = int(ahead), -int(behind)
+        elif record.startswith("? "):
+            status["untracked"].append(record[2:])
+        elif record[:2] in ("1 ", "2 ", "u "):
+            # Ordinary entries have 8 fields before the path, renames 9, unmerged 10
+            fields = {"1": 8, "2": 9, "u": 10}[record[0]]
+            parts = record.split(" ", fields)
+            xy, path = parts[1], parts[-1]
+            if record[0] == "2":
+                next(records, None)  # Original path of the rename
+            if xy[0] != ".":
+                status["staged"].append(path)
             else:
-                status["unstaged"].append(line[3:])
+                status["unstaged"].append(path)
+
+    status["has_changes"] = bool(status["staged"] or status["unstaged"] or status["untracked"])
+    if status["upstream"]:
+        status["remote"] = status["upstream"].split("/", 1)[0]
+    return status
+
+
+def parse_numstat(output: str) -> Dict[str, Tuple[Optional[int], Optional[int]]]:
+    """Parse `git diff --numstat -z` output into {path: (added, deleted)}.
+
+    Binary files report None for both counts.
+    """
+    numstat = {}
+    records = iter(output.split("\0"))
+    for record in records:
+        if not record:
+            continue
+        added, deleted, path = record.split("\t", 2)
+        if not path:
+            # Renames are followed by the old and new paths as separate records
+            next(records, None)
+            path = next(records, "")
+        numstat[path] = (
+            None if added == "-" else int(added),
+            None if deleted == "-" else int(deleted)
+        )
+    return numstat
+
+
+def get_git_status() -> dict:
+    """Take a snapshot of the repository state shared by all later steps.
+
+    Uses one `git status --porcelain=v2 --branch -z` call and one
+    `git diff --numstat -z` call; `git remote` is only consulted when the
+    branch has no upstream.
+    """
+    _, output, _ = run_cmd(["git", "status", "--porcelain=v2", "--branch", "-z"], check=False)
+    status = parse_status_v2(output)
+
+    if not status["remote"]:
+        _, remote, _ = run_cmd(["git", "remote"], check=False)
+        status["remote"] = remote.split("\n")[0] if remote else "origin"
+
+    if status["staged"] or status["unstaged"]:
+        base = ["HEAD"] if status["head"] else ["--cached"]
+        _, numstat, _ = run_cmd(["git", "diff", *base, "--numstat", "-z"], check=False)
+        status["numstat"] = parse_numstat(numstat)
 
     return status
 
 
 def generate_commit_message(status: dict) -> str:
     """Generate a commit message based on changes."""
-    _, diff_stat, _ = run_cmd("git diff --cached --stat", check=False)
-
     # Count file changes
     files_changed = len(status["staged"]) + len(status["unstaged"]) + len(status["untracked"])
 
@@ -96,49 +312,523 @@ def generate_commit_message(status: dict) -> str:
     return f"{prefix} {desc}"
 
 
-def check_sensitive_files() -> list:
-    """Check for potentially sensitive files."""
-    _, output, _ = run_cmd("git diff --cached --name-only", check=False)
-    sensitive_patterns = [r"\.env", r"\.pem", r"\.key", r"password", r"secret", r"credential"]
+def check_sensitive_files(entries: Sequence[Tuple[str, str, str]]) -> list:
+    """Check for potentially sensitive files among the staged blobs.
+
+    Takes `get_staged_blobs()` entries rather than `git status` paths, which
+    collapse untracked directories (`sub/` instead of `sub/.env`).
+    """
+    search = SENSITIVE_NAME_RE.search
+    return [path for path, _, _ in entries if search(path)]
+
+
+@functools.lru_cache(maxsize=4096)
+def shannon_entropy(value: str) -> float:
+    """Return the Shannon entropy of a string in bits per character."""
+    if not value:
+        return 0.0
+    length = len(value)
+    return -sum(n / length * math.log2(n / length) for n in Counter(value).values())
+
+
+def get_staged_blobs(cwd: Optional[str] = None) -> List[Tuple[str, str, str]]:
+    """List staged additions and modifications as (path, old_blob, new_blob)."""
+    _, output, _ = run_cmd(["git", "diff", "--cached", "--raw", "-z", "--no-renames", "--no-abbrev"],
+                           check=False, cwd=cwd)
+    records = output.split("\0")
+    blobs = []
+    for meta, path in zip(records[0::2], records[1::2]):
+        _, new_mode, old_sha, new_sha, change = meta.split(" ")
+        if change != "D" and new_mode != GITLINK_MODE:
+            blobs.append((path, old_sha, new_sha))
+    return blobs
+
+
+class BlobReader:
+    """Read blobs through one long-lived `git cat-file --batch` process."""
+
+    def __init__(self, max_size: int = MAX_SCAN_FILE_BYTES, cwd: Optional[str] = None):
+        self.max_size = max_size
+        self.cwd = cwd
+        self.bytes_read = 0
+        self.start = time.perf_counter()
+        self.proc = subprocess.Popen(["git", "cat-file", "--batch"],
+                                     stdin=subprocess.PIPE, stdout=subprocess.PIPE, cwd=cwd)
+
+    def close(self) -> None:
+        self.proc.stdin.close()
+        self.proc.stdout.close()
+        self.proc.wait()
+        TRACER.process(self.proc.args, self.start, self.proc.returncode, self.bytes_read, self.cwd)
+
+    def read(self, shas: Sequence[str]) -> List[Optional[bytes]]:
+        """Return blob contents in order; None for missing or oversized blobs.
+
+        Callers keep `shas` to a window that fits in the pipe buffer, so the
+        requests can be written in one go without deadlocking on the output.
+        """
+        self.proc.stdin.write("".join(f"{sha}\n" for sha in shas).encode())
+        self.proc.stdin.flush()
+        stdout = self.proc.stdout
+        blobs = []
+        for _ in shas:
+            header = stdout.readline().split()
+            if len(header) != 3:
+                blobs.append(None)
+                continue
+            size = int(header[2])
+            self.bytes_read += size
+            if size > self.max_size:
+                while size > 0:
+                    size -= len(stdout.read(min(size, 1024 * 1024)))
+                blobs.append(None)
+            else:
+                blobs.append(stdout.read(size))
+            stdout.read(1)
+        return blobs
+
+
+def _secret_hits(data: bytes) -> List[Tuple[int, str, bytes]]:
+    """Return (offset, rule, value) for every secret in `data`.
+
+    Token rules only run over short windows around hits of their own
+    keywords, and assignments are found by keyword-prefixed patterns, so a
+    blob full of the word "token" never gets a whole-blob pass per rule.
+    """
+    lowered = data.lower()
+    hits = []
+    for pattern in ASSIGNMENT_RES:
+        for match in pattern.finditer(lowered):
+            start, end = match.span("value")
+            value = data[start:end]
+            if shannon_entropy(value.decode("utf-8", "replace")) >= MIN_SECRET_ENTROPY:
+                hits.append((match.start(), "assignment", value))
+
+    for rule, (_, keywords) in SECRET_RULES.items():
+        spans = []
+        for keyword in keywords:
+            pos = lowered.find(keyword)
+            while pos != -1:
+                spans.append((max(0, pos - SECRET_CONTEXT_BEFORE), pos + len(keyword) + SECRET_CONTEXT_AFTER))
+                pos = lowered.find(keyword, pos + len(keyword))
+        if not spans:
+            continue
+        spans.sort()
+        merged = [list(spans[0])]
+        for lo, hi in spans[1:]:
+            if lo <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], hi)
+            else:
+                merged.append([lo, hi])
+        for lo, hi in merged:
+            hits.extend((match.start(), rule, match.group())
+                        for match in SECRET_RES[rule].finditer(data, lo, min(hi, len(data))))
+    hits.sort()
+    return hits
+
+
+def _scan_blobs(entries: Sequence[Tuple[str, str, str]], cwd: Optional[str] = None) -> List[dict]:
+    """Search staged blobs for secrets, skipping binary and oversized ones.
+
+    A hit in a modified file is only reported if the matched text was not
+    already present in the previous version of that file.
+    """
+    findings = []
+    reader = BlobReader(cwd=cwd)
+    try:
+        for start in range(0, len(entries), SCAN_WINDOW):
+            window = entries[start:start + SCAN_WINDOW]
+            for (path, old_sha, _), data in zip(window, reader.read([e[2] for e in window])):
+                if data is None or b"\0" in data[:BINARY_SNIFF_BYTES]:
+                    continue
+                hits = _secret_hits(data)
+                if hits and old_sha != NULL_SHA:
+                    previous = reader.read([old_sha])[0] or b""
+                    hits = [hit for hit in hits if hit[2] not in previous]
+                line, counted = 1, 0
+                for offset, rule, value in hits:
+                    line += data.count(b"\n", counted, offset)
+                    counted = offset
+                    findings.append({
+                        "path": path,
+                        "line": line,
+                        "rule": rule,
+                        "excerpt": value[:4].decode("utf-8", "replace") + "…"
+                    })
+    finally:
+        reader.close()
+    return findings
+
+
+def scan_staged_changes(cwd: Optional[str] = None,
+                        entries: Optional[List[Tuple[str, str, str]]] = None) -> List[dict]:
+    """Scan the content of every staged addition or modification for secrets.
+
+    Changesets above SCAN_PARALLEL_THRESHOLD files are split across worker
+    processes, each with its own `git cat-file`, since matching is CPU-bound
+    and threads would only take turns on the GIL. Returns findings as dicts
+    with `path`, `line`, `rule` and a masked `excerpt`.
+    """
+    if entries is None:
+        entries = get_staged_blobs(cwd)
+    workers = min(SCAN_WORKERS, os.cpu_count() or 1)
+    if len(entries) < SCAN_PARALLEL_THRESHOLD or workers < 2:
+        return _scan_blobs(entries, cwd)
+
+    chunk = -(-len(entries) // workers)
+    chunks = [entries[i:i + chunk] for i in range(0, len(entries), chunk)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        found = pool.map(functools.partial(_scan_blobs, cwd=cwd), chunks)
+        return [finding for findings in found for finding in findings]
+
+
+def parse_size(value: str) -> int:
+    """Parse a byte size such as `500K`, `50M` or `2G`."""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMG]?)i?B?\s*", value, re.IGNORECASE)
+    if not match:
+        raise argparse.ArgumentTypeError(f"invalid size: {value}")
+    number, unit = match.groups()
+    return int(float(number) * 1024 ** " KMG".index(unit.upper() or " "))
+
+
+def positive_int(value: str) -> int:
+    """Parse an integer of at least 1, e.g. for `--jobs`."""
+    number = non_negative_int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1: {value}")
+    return number
+
+
+def non_negative_int(value: str) -> int:
+    """Parse an integer of at least 0, e.g. for `--retries`."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid integer: {value}") from None
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must not be negative: {value}")
+    return number
+
+
+def format_size(size: float) -> str:
+    """Format a byte count for humans."""
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}" if unit != "B" else f"{int(size)} B"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def check_large_blobs(entries: Sequence[Tuple[str, str, str]], warn_size: int, max_size: int,
+                      lfs_patterns: Sequence[str] = (), cwd: Optional[str] = None) -> Tuple[list, list]:
+    """Size every staged blob in one `git cat-file --batch-check` pass.
+
+    Returns (errors, warnings) as lists of messages: blobs over `max_size` are
+    errors, blobs over `warn_size` warnings, as are real (non-pointer) blobs
+    on paths that should be stored in Git LFS according to `.gitattributes`
+    or `lfs_patterns`.
+    """
+    if not entries:
+        return [], []
+    result = traced_run(["git", "cat-file", "--batch-check=%(objectname) %(objectsize)"],
+                            input="".join(f"{sha}\n" for _, _, sha in entries),
+                            capture_output=True, text=True, cwd=cwd)
+    sizes = {}
+    for line in result.stdout.splitlines():
+        sha, _, size = line.partition(" ")
+        if size.isdigit():
+            sizes[sha] = int(size)
+
+    result = traced_run(["git", "check-attr", "-z", "--stdin", "filter"],
+                            input="\0".join(path for path, _, _ in entries) + "\0",
+                            capture_output=True, text=True, cwd=cwd)
+    attrs = result.stdout.split("\0")
+    lfs_paths = {path for path, _, value in zip(attrs[0::3], attrs[1::3], attrs[2::3])
+                 if value == "lfs"}
+
+    errors, warnings = [], []
+    for path, _, sha in entries:
+        size = sizes.get(sha, 0)
+        if size > max_size:
+            errors.append(f"{path} is {format_size(size)} (limit {format_size(max_size)})")
+        elif size > warn_size:
+            warnings.append(f"{path} is {format_size(size)}")
+        if size > LFS_POINTER_MAX_SIZE and (
+                path in lfs_paths or any(fnmatch.fnmatch(path, p) for p in lfs_patterns)):
+            warnings.append(f"{path} matches an LFS pattern but is staged as a regular "
+                            f"{format_size(size)} blob")
+    return errors, warnings
+
 
-    warnings = []
-    for file in output.split("\n"):
-        for pattern in sensitive_patterns:
-            if re.search(pattern, file, re.IGNORECASE):
-                warnings.append(file)
-                break
+class PushProgress:
+    """Turn `git push --progress` output into a live throughput and ETA line."""
 
-    return warnings
+    def __init__(self, out=sys.stdout):
+        self.out = out
+        self.start = time.monotonic()
+        self.width = 0
+
+    def feed(self, line: str) -> None:
+        match = PROGRESS_RE.search(line)
+        if not match:
+            self.clear()
+            print(f"   {line}", file=self.out)
+            return
+        phase, percent, transferred, unit, rate, rate_unit = match.groups()
+        percent = int(percent)
+        text = f"   {phase} {percent}%"
+        if transferred:
+            done = float(transferred) * UNITS[unit]
+            text += f", {format_size(done)}"
+            if rate:
+                speed = float(rate) * UNITS[rate_unit]
+                text += f" at {format_size(speed)}/s"
+                if 0 < percent < 100 and speed:
+                    eta = done / percent * (100 - percent) / speed
+                    text += f", ETA {eta:.0f}s"
+        elif 0 < percent < 100:
+            elapsed = time.monotonic() - self.start
+            text += f", ETA {elapsed / percent * (100 - percent):.0f}s"
+        self.out.write("\r" + text.ljust(self.width))
+        self.out.flush()
+        self.width = len(text)
+
+    def clear(self) -> None:
+        if self.width:
+            self.out.write("\n")
+            self.width = 0
 
 
 def create_branch(branch_name: str) -> bool:
     """Create and switch to a new branch."""
-    code, _, _ = run_cmd(f"git checkout -b {branch_name}")
+    code, _, _ = run_cmd(["git", "checkout", "-b", branch_name])
     return code == 0
 
 
-def push_changes(remote: str, branch: str, set_upstream: bool = False) -> bool:
-    """Push changes to remote."""
-    upstream = "-u " if set_upstream else ""
-    code, _, _ = run_cmd(f"git push {upstream}{remote} {branch}")
+def push_changes(remote: str, branch: str, set_upstream: bool = False, progress: bool = False) -> bool:
+    """Push changes to remote, optionally reporting live progress."""
+    upstream = ["-u"] if set_upstream else []
+    if not progress:
+        code, _, _ = run_cmd(["git", "push", *upstream, remote, branch])
+        return code == 0
+
+    start = time.perf_counter()
+    proc = subprocess.Popen(["git", "push", "--progress", *upstream, remote, branch],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    reporter = PushProgress()
+    pending = b""
+    bytes_read = 0
+    while True:
+        chunk = proc.stderr.read1(4096)
+        if not chunk:
+            break
+        bytes_read += len(chunk)
+        # Progress updates are terminated by \r, everything else by \n
+        *lines, pending = re.split(rb"[\r\n]", pending + chunk)
+        for line in lines:
+            if line.strip():
+                reporter.feed(line.decode("utf-8", "replace").strip())
+    if pending.strip():
+        reporter.feed(pending.decode("utf-8", "replace").strip())
+    reporter.clear()
+    proc.stderr.close()
+    code = proc.wait()
+    TRACER.process(proc.args, start, code, bytes_read)
     return code == 0
 
 
-def create_pr(title: Optional[str] = None, body: Optional[str] = None) -> bool:
-    """Create a pull request using GitHub CLI."""
+class GitHubError(Exception):
+    """A GitHub REST API request failed.
+
+    `status` is the HTTP status code, or None if no response arrived.
+    """
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+    @property
+    def retryable(self) -> bool:
+        """True for network errors, throttling (429) and server errors (5xx)."""
+        return self.status is None or self.status == 429 or self.status >= 500
+
+
+class GitHubClient:
+    """Minimal GitHub REST client over a pool of keep-alive connections.
+
+    One client can open many pull requests, across repositories and threads,
+    reusing both the connections and the auth token. Set GITHUB_API_URL to
+    point it at GitHub Enterprise or a local stub server.
+    """
+
+    def __init__(self, token: str, api_url: Optional[str] = None, pool_size: int = HTTP_POOL_SIZE,
+                 timeout: float = HTTP_TIMEOUT):
+        url = urllib.parse.urlsplit(api_url or os.getenv("GITHUB_API_URL") or GITHUB_API_URL)
+        self.token = token
+        self.https = url.scheme == "https"
+        self.host = url.netloc
+        self.prefix = url.path.rstrip("/")
+        self.timeout = timeout
+        self.pool = queue.LifoQueue(maxsize=pool_size)
+        self.default_branches: Dict[str, str] = {}
+
+    def _connection(self) -> http.client.HTTPConnection:
+        try:
+            return self.pool.get_nowait()
+        except queue.Empty:
+            cls = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+            try:
+                return cls(self.host, timeout=self.timeout)
+            except ValueError as e:
+                raise GitHubError(f"invalid GitHub API URL: {e}") from e
+
+    def _release(self, conn: http.client.HTTPConnection) -> None:
+        try:
+            self.pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def close(self) -> None:
+        while not self.pool.empty():
+            self.pool.get_nowait().close()
+
+    def request(self, method: str, path: str, payload: Optional[dict] = None) -> dict:
+        """Send a request and return the decoded JSON object; any failure raises GitHubError."""
+        body = json.dumps(payload).encode() if payload is not None else None
+        headers = {
+            "Accept": "application/vnd.github+json",
+            "Authorization": f"Bearer {self.token}",
+            "User-Agent": "git-push-skill",
+            "X-GitHub-Api-Version": "2022-11-28",
+        }
+        if body is not None:
+            headers["Content-Type"] = "application/json"
+
+        for attempt in range(2):
+            conn = self._connection()
+            start = time.perf_counter()
+            try:
+                conn.request(method, self.prefix + path, body=body, headers=headers)
+                response = conn.getresponse()
+                data = response.read()
+                TRACER.add(f"{method} {path}", "http", start, time.perf_counter(),
+                           status=response.status, bytes_read=len(data))
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError) as e:
+                # The server closed an idle pooled connection; retry once on a new one
+                conn.close()
+                if attempt:
+                    raise GitHubError(f"{method} {path} failed: {e}") from e
+                continue
+            except (OSError, ValueError, http.client.HTTPException) as e:
+                conn.close()
+                raise GitHubError(f"{method} {path} failed: {e or type(e).__name__}") from e
+            except Exception:
+                conn.close()
+                raise
+            if response.will_close:
+                conn.close()
+            else:
+                self._release(conn)
+
+            # Proxies and load balancers answer 502/504 with HTML or nothing at all
+            text = data.decode("utf-8", "replace")
+            try:
+                result = json.loads(text) if text.strip() else {}
+            except ValueError:
+                result = None
+            if response.status >= 400:
+                if isinstance(result, dict) and result.get("message"):
+                    message = str(result["message"])
+                    errors = result.get("errors")
+                    if isinstance(errors, list) and errors:
+                        message += ": " + "; ".join(
+                            str(e.get("message", e)) if isinstance(e, dict) else str(e) for e in errors)
+                else:
+                    message = " ".join(text.split())[:200] or response.reason
+                raise GitHubError(f"{method} {path} failed ({response.status}): {message}", response.status)
+            if not isinstance(result, dict):
+                raise GitHubError(f"{method} {path} returned invalid JSON ({response.status}): "
+                                  f"{' '.join(text.split())[:200]}", response.status)
+            return result
+        raise AssertionError("unreachable")
+
+    def default_branch(self, repo: str) -> str:
+        if repo not in self.default_branches:
+            branch = self.request("GET", f"/repos/{repo}").get("default_branch")
+            if not branch:
+                raise GitHubError(f"GET /repos/{repo} returned no default branch")
+            self.default_branches[repo] = branch
+        return self.default_branches[repo]
+
+    def create_pull_request(self, repo: str, head: str, title: str, body: str = "",
+                            base: Optional[str] = None) -> str:
+        """Open a pull request on `owner/name` and return its URL."""
+        payload = {"title": title, "head": head, "base": base or self.default_branch(repo), "body": body}
+        url = self.request("POST", f"/repos/{repo}/pulls", payload).get("html_url")
+        if not url:
+            raise GitHubError(f"POST /repos/{repo}/pulls returned no html_url")
+        return url
+
+
+def get_github_token() -> Optional[str]:
+    """Find a GitHub token in the environment, falling back to `gh auth token`."""
+    token = os.getenv("GITHUB_TOKEN") or os.getenv("GH_TOKEN")
+    if token or shutil.which("gh") is None:
+        return token
+    code, token, _ = run_cmd(["gh", "auth", "token"], check=False)
+    return token if code == 0 and token else None
+
+
+def get_github_repo(remote: str, cwd: Optional[str] = None) -> Optional[str]:
+    """Return `owner/name` for a remote pointing at GitHub, if it does."""
+    code, url, _ = run_cmd(["git", "remote", "get-url", remote], check=False, cwd=cwd)
+    match = GITHUB_REMOTE_RE.search(url) if code == 0 else None
+    return match.group(1) if match else None
+
+
+def open_pull_request(client: GitHubClient, remote: str, branch: str, title: Optional[str] = None,
+                      body: Optional[str] = None, cwd: Optional[str] = None) -> str:
+    """Open a PR for `branch` through the REST API and return its URL.
+
+    Without a title, the last commit's subject and body are used, like
+    `gh pr create --fill`.
+    """
+    repo = get_github_repo(remote, cwd)
+    if repo is None:
+        raise GitHubError(f"remote '{remote}' is not a GitHub repository")
+    if not title:
+        _, message, _ = run_cmd(["git", "log", "-1", "--format=%s%x00%b"], check=False, cwd=cwd)
+        title, _, commit_body = message.partition("\0")
+        body = body or commit_body.strip()
+    return client.create_pull_request(repo, branch, title, body or "")
+
+
+def create_pr(title: Optional[str] = None, body: Optional[str] = None, remote: str = "origin",
+              branch: str = "", client: Optional[GitHubClient] = None) -> bool:
+    """Create a pull request via the GitHub REST API, or GitHub CLI without a token."""
+    if client is None:
+        token = get_github_token()
+        client = GitHubClient(token) if token else None
+    if client is not None and branch:
+        try:
+            print(f"PR created: {open_pull_request(client, remote, branch, title, body)}")
+            return True
+        except GitHubError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return False
+
     # Check if gh is installed
-    code, _, _ = run_cmd("gh --version", check=False)
-    if code != 0:
+    if shutil.which("gh") is None:
         print("Error: GitHub CLI (gh) is not installed", file=sys.stderr)
         return False
 
-    cmd = "gh pr create"
+    cmd = ["gh", "pr", "create"]
     if title:
-        cmd += f' --title "{title}"'
+        cmd += ["--title", title]
     if body:
-        cmd += f' --body "{body}"'
+        cmd += ["--body", body]
     if not title and not body:
-        cmd += " --fill"
+        cmd.append("--fill")
 
     code, output, _ = run_cmd(cmd)
     if code == 0:
@@ -146,6 +836,166 @@ def create_pr(title: Optional[str] = None, body: Optional[str] = None) -> bool:
     return code == 0
 
 
+async def run_cmd_async(cmd: Sequence[str], cwd: Optional[str] = None) -> Tuple[int, str, str]:
+    """Run a command as an asyncio subprocess and return (returncode, stdout, stderr)."""
+    start = time.perf_counter()
+    proc = await asyncio.create_subprocess_exec(
+        *cmd, cwd=cwd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+    stdout, stderr = await proc.communicate()
+    TRACER.process(cmd, start, proc.returncode, len(stdout) + len(stderr), cwd)
+    return proc.returncode, stdout.decode().strip(), stderr.decode().strip()
+
+
+async def get_git_status_async(repo: str) -> dict:
+    """Async counterpart of get_git_status() for a repository at `repo`.
+
+    Raises RuntimeError with git's message if `repo` is not a usable repository.
+    """
+    code, output, err = await run_cmd_async(["git", "status", "--porcelain=v2", "--branch", "-z"], repo)
+    if code != 0:
+        raise RuntimeError(err.splitlines()[0] if err else f"git status exited with status {code}")
+    status = parse_status_v2(output)
+    if not status["remote"]:
+        _, remote, _ = await run_cmd_async(["git", "remote"], repo)
+        status["remote"] = remote.split("\n")[0] if remote else "origin"
+    return status
+
+
+async def run_with_retry(cmd: Sequence[str], repo: str, retries: int,
+                         backoff: float = RETRY_BACKOFF) -> Tuple[int, str, str, int]:
+    """Run a network command, retrying failures with exponential backoff and jitter.
+
+    Returns (returncode, stdout, stderr, attempts).
+    """
+    for attempt in range(1, retries + 2):
+        code, stdout, stderr = await run_cmd_async(cmd, repo)
+        if code == 0 or attempt > retries:
+            return code, stdout, stderr, attempt
+        await asyncio.sleep(backoff * 2 ** (attempt - 1) * (1 + random.random()))
+    raise AssertionError("unreachable")
+
+
+async def push_repo(repo: str, args: argparse.Namespace, limit: asyncio.Semaphore,
+                    client: Optional[GitHubClient] = None) -> dict:
+    """Run status, safety checks, commit, push and optional PR creation for one repository.
+
+    PRs go through `client` when given, otherwise through GitHub CLI.
+    """
+    result = {"repo": repo, "branch": "", "status": "failed", "attempts": 0, "detail": ""}
+    start = time.perf_counter()
+    async with limit:
+        try:
+            status = await get_git_status_async(repo)
+            result["branch"] = status["branch"]
+            if not status["has_changes"] and status["ahead"] == 0:
+                result["status"] = "clean"
+                return result
+
+            if args.branch:
+                code, _, err = await run_cmd_async(["git", "checkout", "-b", args.branch], repo)
+                if code != 0:
+                    result["detail"] = err
+                    return result
+                status["branch"] = result["branch"] = args.branch
+
+            if status["has_changes"]:
+                _, index_tree, _ = await run_cmd_async(["git", "write-tree"], repo)
+                await run_cmd_async(["git", "add", "-A"], repo)
+                if not args.force:
+                    entries = await asyncio.to_thread(get_staged_blobs, repo)
+                    errors, _ = await asyncio.to_thread(
+                        check_large_blobs, entries, args.warn_blob_size, args.max_blob_size,
+                        args.lfs_pattern, repo)
+                    warnings = errors + check_sensitive_files(entries)
+                    findings = await asyncio.to_thread(scan_staged_changes, repo, entries)
+                    if warnings or findings:
+                        if index_tree:
+                            await run_cmd_async(["git", "read-tree", index_tree], repo)
+                        result["status"] = "blocked"
+                        result["detail"] = ", ".join(
+                            warnings + [f"{f['path']}:{f['line']} {f['rule']}" for f in findings])
+                        return result
+
+                message = args.message or generate_commit_message(status)
+                code, _, err = await run_cmd_async(["git", "commit", "-m", message], repo)
+                if code != 0:
+                    result["detail"] = err
+                    return result
+
+            upstream = ["-u"] if args.branch or not status["upstream"] else []
+            code, _, err, result["attempts"] = await run_with_retry(
+                ["git", "push", *upstream, status["remote"], status["branch"]], repo, args.retries)
+            if code != 0:
+                result["detail"] = err.splitlines()[0] if err else "push failed"
+                return result
+            result["status"] = "pushed"
+
+            if args.pr and client is not None:
+                for attempt in range(args.retries + 1):
+                    try:
+                        result["detail"] = await asyncio.to_thread(
+                            open_pull_request, client, status["remote"], status["branch"],
+                            args.title, args.body, repo)
+                        break
+                    except GitHubError as e:
+                        if not e.retryable or attempt == args.retries:
+                            result["status"] = "pushed, PR failed"
+                            result["detail"] = str(e)
+                            return result
+                        await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt * (1 + random.random()))
+                result["status"] = "pushed + PR"
+            elif args.pr:
+                cmd = ["gh", "pr", "create"]
+                cmd += ["--title", args.title] if args.title else []
+                cmd += ["--body", args.body] if args.body else []
+                cmd += [] if args.title or args.body else ["--fill"]
+                code, output, err, _ = await run_with_retry(cmd, repo, args.retries)
+                if code != 0:
+                    result["status"] = "pushed, PR failed"
+                    result["detail"] = err
+                    return result
+                result["status"] = "pushed + PR"
+                result["detail"] = output
+            return result
+        except Exception as e:
+            result["detail"] = str(e)
+            return result
+        finally:
+            result["seconds"] = time.perf_counter() - start
+            TRACER.add(repo, "phase", start, start + result["seconds"], lane=repo, status=result["status"])
+
+
+async def run_batch(repos: Sequence[str], args: argparse.Namespace) -> List[dict]:
+    """Push many repositories concurrently, at most `args.jobs` at a time."""
+    limit = asyncio.Semaphore(args.jobs)
+    client = None
+    if args.pr:
+        token = await asyncio.to_thread(get_github_token)
+        client = GitHubClient(token, pool_size=args.jobs) if token else None
+    try:
+        return await asyncio.gather(*(push_repo(repo, args, limit, client) for repo in repos))
+    finally:
+        if client is not None:
+            client.close()
+
+
+def print_results(results: Sequence[dict]) -> None:
+    """Print one aligned row per repository."""
+    width = max([len("Repository")] + [len(r["repo"]) for r in results])
+    print(f"{'Repository':<{width}}  {'Branch':<20}  {'Status':<18}  {'Tries':>5}  {'Time':>7}  Detail")
+    for r in results:
+        print(f"{r['repo']:<{width}}  {r['branch']:<20}  {r['status']:<18}  "
+              f"{r['attempts']:>5}  {r['seconds']:>6.1f}s  {r['detail']}")
+
+
+def read_manifest(path: str) -> List[str]:
+    """Read repository paths, one per line, relative to the manifest; `#` starts a comment."""
+    base = os.path.dirname(os.path.abspath(path))
+    with open(path) as f:
+        lines = (line.split("#", 1)[0].strip() for line in f)
+        return [os.path.join(base, line) for line in lines if line]
+
+
 def main():
     parser = argparse.ArgumentParser(description="Automated Git push workflow")
     parser.add_argument("-m", "--message", help="Commit message")
@@ -154,64 +1004,143 @@ def main():
     parser.add_argument("--title", help="PR title (requires --pr)")
     parser.add_argument("--body", help="PR body (requires --pr)")
     parser.add_argument("--force", action="store_true", help="Skip safety checks")
+    parser.add_argument("--progress", action="store_true", help="Show live push throughput and ETA")
+    parser.add_argument("--max-blob-size", type=parse_size, default=MAX_BLOB_SIZE,
+                        help="Abort if a staged file is larger than this (default: 100M)")
+    parser.add_argument("--warn-blob-size", type=parse_size, default=WARN_BLOB_SIZE,
+                        help="Warn if a staged file is larger than this (default: 50M)")
+    parser.add_argument("--lfs-pattern", action="append", default=[], metavar="GLOB",
+                        help="Warn if a file matching this glob is not stored in Git LFS (repeatable)")
+    parser.add_argument("--repos", nargs="+", metavar="PATH", help="Push several repositories concurrently")
+    parser.add_argument("--manifest", help="File listing repository paths, one per line")
+    parser.add_argument("-j", "--jobs", type=positive_int, default=8, help="Repositories processed at once (batch mode)")
+    parser.add_argument("--retries", type=non_negative_int, default=3, help="Retries for push and PR creation (batch mode)")
+    parser.add_argument("--profile", metavar="FILE", help="Write per-phase and per-command timings to FILE")
+    parser.add_argument("--profile-format", choices=["chrome", "json"], default="chrome",
+                        help="Profile format: Chrome trace (default) or plain JSON")
     args = parser.parse_args()
 
+    if not args.profile:
+        return run(args)
+    TRACER.enabled = True
+    try:
+        return run(args)
+    finally:
+        TRACER.write(args.profile, args.profile_format)
+        summary = TRACER.summary()
+        print(f"⏱️  Profile written to {args.profile} ({summary['processes']} processes, "
+              f"{format_size(summary['bytes_read'])} read)")
+
+
+def run(args: argparse.Namespace) -> int:
+    """Run the push workflow for the parsed command line."""
+    if args.repos or args.manifest:
+        repos = list(args.repos or [])
+        if args.manifest:
+            repos += read_manifest(args.manifest)
+        print(f"🚀 Pushing {len(repos)} repositories ({args.jobs} at a time)...")
+        with TRACER.phase("batch"):
+            results = asyncio.run(run_batch(repos, args))
+        print_results(results)
+        ok = sum(r["status"] in ("clean", "pushed", "pushed + PR") for r in results)
+        print(f"{'✅' if ok == len(results) else '⚠️ '} {ok}/{len(results)} repositories succeeded")
+        return 0 if ok == len(results) else 1
+
     print("🔍 Checking git status...")
-    status = get_git_status()
+    with TRACER.phase("status"):
+        status = get_git_status()
 
     if not status["has_changes"]:
         print("✅ Nothing to push - working tree is clean")
         return 0
 
     print(f"📁 Branch: {status['branch']}")
-    print(f"📝 Changes: {len(status['staged'])} staged, {len(status['unstaged'])} unstaged, {len(status['untracked'])} untracked")
+    added = sum(a or 0 for a, _ in status["numstat"].values())
+    deleted = sum(d or 0 for _, d in status["numstat"].values())
+    print(f"📝 Changes: {len(status['staged'])} staged, {len(status['unstaged'])} unstaged, {len(status['untracked'])} untracked (+{added}/-{deleted})")
+
+    # Remember the index so an aborted safety check can restore it
+    index_tree = None
+    if not args.force:
+        code, index_tree, _ = run_cmd(["git", "write-tree"], check=False)
+        index_tree = index_tree if code == 0 else None
+
+    # Stage all changes
+    print("📦 Staging changes...")
+    with TRACER.phase("stage"):
+        run_cmd(["git", "add", "-A"])
 
     # Safety check
     if not args.force:
-        warnings = check_sensitive_files()
-        if warnings:
-            print(f"⚠️  Warning: Potentially sensitive files detected:")
-            for w in warnings:
-                print(f"   - {w}")
+        with TRACER.phase("safety"):
+            entries = get_staged_blobs()
+            errors, size_warnings = check_large_blobs(entries, args.warn_blob_size, args.max_blob_size,
+                                                      args.lfs_pattern)
+            warnings = check_sensitive_files(entries)
+            findings = [] if errors else scan_staged_changes(entries=entries)
+        if errors:
+            print(f"❌ Staged blobs exceed the size limit:")
+            for e in errors:
+                print(f"   - {e}")
+            if index_tree:
+                run_cmd(["git", "read-tree", index_tree])
+            print("Aborted. Remove the files, track them with Git LFS, or use --force.")
+            return 1
+
+        if warnings or findings or size_warnings:
+            if size_warnings:
+                print(f"⚠️  Warning: Large files staged:")
+                for w in size_warnings:
+                    print(f"   - {w}")
+            if warnings:
+                print(f"⚠️  Warning: Potentially sensitive files detected:")
+                for w in warnings:
+                    print(f"   - {w}")
+            if findings:
+                print(f"⚠️  Warning: Possible secrets in staged changes:")
+                for f in findings:
+                    print(f"   - {f['path']}:{f['line']} {f['rule']} ({f['excerpt']})")
             response = input("Continue anyway? [y/N]: ")
             if response.lower() != "y":
+                if index_tree:
+                    run_cmd(["git", "read-tree", index_tree])
                 print("Aborted.")
                 return 1
 
     # Create branch if specified
     if args.branch:
         print(f"🌿 Creating branch: {args.branch}")
-        if not create_branch(args.branch):
-            return 1
+        with TRACER.phase("branch"):
+            if not create_branch(args.branch):
+                return 1
         status["branch"] = args.branch
 
-    # Stage all changes
-    print("📦 Staging changes...")
-    run_cmd("git add -A")
-
     # Generate or use provided commit message
     message = args.message or generate_commit_message(status)
     print(f"💬 Commit message: {message}")
 
     # Commit
     print("✍️  Committing...")
-    code, _, _ = run_cmd(f'git commit -m "{message}"')
+    with TRACER.phase("commit"):
+        code, _, _ = run_cmd(["git", "commit", "-m", message])
     if code != 0:
         return 1
 
     # Push
     print(f"🚀 Pushing to {status['remote']}/{status['branch']}...")
     set_upstream = args.branch is not None
-    if not push_changes(status["remote"], status["branch"], set_upstream):
-        return 1
+    with TRACER.phase("push"):
+        if not push_changes(status["remote"], status["branch"], set_upstream, args.progress):
+            return 1
 
     print("✅ Push successful!")
 
     # Create PR if requested
     if args.pr:
         print("📋 Creating pull request...")
-        if not create_pr(args.title, args.body):
-            return 1
+        with TRACER.phase("pr"):
+            if not create_pr(args.title, args.body, status["remote"], status["branch"]):
+                return 1
 
     return 0
 
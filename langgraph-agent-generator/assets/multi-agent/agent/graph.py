@@ -1,25 +1,35 @@
 from langgraph.graph import StateGraph, END
 
 from .state import MultiAgentState
-from .nodes import supervisor, researcher, writer
+from .nodes import AGENTS, supervisor, researcher, dispatch_research, research_worker, merge_research, writer
 
 
 def route_to_agent(state: MultiAgentState) -> str:
     """Route to the next agent based on supervisor decision."""
-    next_agent = state.get("next_agent", "supervisor")
-    if next_agent == "FINISH":
-        return END
-    return next_agent
+    next_agent = state.get("next_agent")
+    if next_agent in AGENTS:
+        return next_agent
+    return END
 
 
-def create_multi_agent():
-    """Create a multi-agent system with supervisor pattern."""
+def create_multi_agent(checkpointer=None):
+    """Create a multi-agent system with supervisor pattern.
+
+    Research is fanned out: the researcher splits the request into
+    subtasks, `Send` runs a worker per subtask in parallel, and their
+    findings are merged into one message before the supervisor moves on.
+
+    Pass a `checkpointer` (e.g. `SqliteDeltaSaver()`) to persist and resume
+    threads.
+    """
 
     graph = StateGraph(MultiAgentState)
 
     # Add nodes
     graph.add_node("supervisor", supervisor)
     graph.add_node("researcher", researcher)
+    graph.add_node("research_worker", research_worker)
+    graph.add_node("merge_research", merge_research)
     graph.add_node("writer", writer)
 
     # Set entry point
@@ -35,7 +45,9 @@ def create_multi_agent():
             END: END
         }
     )
-    graph.add_edge("researcher", "supervisor")
+    graph.add_conditional_edges("researcher", dispatch_research, ["research_worker"])
+    graph.add_edge("research_worker", "merge_research")
+    graph.add_edge("merge_research", "supervisor")
     graph.add_edge("writer", "supervisor")
 
-    return graph.compile()
+    return graph.compile(checkpointer=checkpointer)
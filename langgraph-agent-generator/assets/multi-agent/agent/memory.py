@@ -0,0 +1,84 @@
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from langchain_core.messages import BaseMessage, HumanMessage, RemoveMessage, SystemMessage, ToolMessage
+
+from .llm import INTERNAL_TAG
+
+SUMMARY_PROMPT = """Update the running summary of a conversation with the new messages below.
+Keep facts, decisions, open questions and tool results that later turns may need.
+Reply with the updated summary only, in at most 300 words.
+
+Current summary:
+{summary}
+
+New messages:
+{transcript}"""
+
+
+def approximate_tokens(message: BaseMessage) -> int:
+    """Cheap token estimate (about 4 characters per token, plus per-message overhead)."""
+    content = message.content if isinstance(message.content, str) else str(message.content)
+    tokens = len(content) // 4 + 4
+    for call in getattr(message, "tool_calls", None) or ():
+        tokens += (len(call["name"]) + len(str(call["args"]))) // 4 + 4
+    return tokens
+
+
+class HistoryCompactor:
+    """Keep the message history sent to the model under a token budget.
+
+    Once the history exceeds `max_tokens`, the oldest messages are folded into
+    a rolling summary (`state["summary"]`) and removed from state, leaving a
+    window of at most `keep_tokens` (default: half the budget). The window
+    never starts with tool results whose tool call was summarized away. The
+    summary is sent to the model as part of the system prompt.
+    """
+
+    def __init__(self, llm, max_tokens: int = 8000, keep_tokens: Optional[int] = None,
+                 count_tokens: Callable[[BaseMessage], int] = approximate_tokens):
+        self.llm = llm
+        self.max_tokens = max_tokens
+        self.keep_tokens = keep_tokens or max_tokens // 2
+        self.count_tokens = count_tokens
+
+    def split(self, messages: Sequence[BaseMessage]) -> Tuple[list, list]:
+        """Split `messages` into (to summarize, to keep)."""
+        start, total = len(messages), 0
+        while start > 0:
+            cost = self.count_tokens(messages[start - 1])
+            # The latest message is always kept, whatever its size
+            if total + cost > self.keep_tokens and start < len(messages):
+                break
+            total += cost
+            start -= 1
+        while 0 < start < len(messages) and isinstance(messages[start], ToolMessage):
+            start -= 1
+        return list(messages[:start]), list(messages[start:])
+
+    async def summarize(self, summary: str, messages: Sequence[BaseMessage]) -> str:
+        transcript = "\n".join(f"{message.type}: {message.content}" for message in messages)
+        prompt = SUMMARY_PROMPT.format(summary=summary or "(none)", transcript=transcript)
+        response = await self.llm.ainvoke([HumanMessage(content=prompt)], {"tags": [INTERNAL_TAG]})
+        return response.content
+
+    async def compact(self, state: dict, system_prompt: Optional[str] = None) -> Tuple[dict, List[BaseMessage]]:
+        """Return `(state update, messages to send to the model)`.
+
+        The update is empty while the history fits the budget. Otherwise it
+        holds the new summary and `RemoveMessage`s for the summarized
+        messages; merge it into the node's return value.
+        """
+        messages = state["messages"]
+        summary = state.get("summary") or ""
+        update = {}
+        if sum(self.count_tokens(message) for message in messages) > self.max_tokens:
+            old, messages = self.split(messages)
+            if old:
+                summary = await self.summarize(summary, old)
+                update = {"summary": summary, "messages": [RemoveMessage(id=message.id) for message in old]}
+
+        if summary:
+            context = f"Summary of the earlier conversation:\n{summary}"
+            system_prompt = f"{system_prompt}\n\n{context}" if system_prompt else context
+        prompt = [SystemMessage(content=system_prompt)] if system_prompt else []
+        return update, prompt + list(messages)
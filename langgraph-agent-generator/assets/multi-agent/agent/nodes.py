@@ -1,47 +1,119 @@
-import os
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import AIMessage, SystemMessage
+import asyncio
+import re
+import weakref
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langgraph.types import Send
 
-from .state import MultiAgentState
+from .llm import LazyLLM
+from .memory import HistoryCompactor
+from .router import FINISH, KeywordRouter, Router, latest_request
+from .state import MultiAgentState, ResearchTask
 
-llm = ChatOpenAI(
-    base_url="https://openrouter.ai/api/v1",
-    api_key=os.getenv("OPENROUTER_API_KEY"),
-    model="anthropic/claude-3.5-sonnet"
+# Resolved through get_llm() on first use
+llm = LazyLLM()
+
+# Older turns are summarized once the history passes this many tokens
+MAX_HISTORY_TOKENS = 8000
+
+compactor = HistoryCompactor(llm, max_tokens=MAX_HISTORY_TOKENS)
+
+# Agents the supervisor may route to, with descriptions for the LLM router
+AGENTS = {
+    "researcher": "gathers and analyzes information",
+    "writer": "creates well-structured content from the research",
+}
+
+# Supervisor decisions allowed per request before the run is finished
+MAX_HOPS = 10
+
+router = Router(
+    llm,
+    AGENTS,
+    routers=[KeywordRouter({
+        "researcher": ["research", "find", "look up", "search", "investigat", "analy", "compar", "fact", "source"],
+        "writer": ["write", "draft", "essay", "article", "blog", "post", "report", "summar", "email", "rewrite"],
+    })],
+    max_hops=MAX_HOPS,
 )
 
+# Most research subtasks the supervisor's request is split into
+MAX_SUBTASKS = 5
+
+# Research workers allowed to call the LLM at once, across all runs
+MAX_PARALLEL_RESEARCH = 3
+
+# Semaphores are bound to an event loop, so keep one per loop
+_research_slots = weakref.WeakKeyDictionary()
+
+
+def _research_slot() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    if loop not in _research_slots:
+        _research_slots[loop] = asyncio.Semaphore(MAX_PARALLEL_RESEARCH)
+    return _research_slots[loop]
 
-def supervisor(state: MultiAgentState) -> dict:
+
+def _request(state: MultiAgentState) -> str:
+    index = latest_request(state["messages"])
+    return state["messages"][index].content if index >= 0 else state.get("summary", "")
+
+
+async def supervisor(state: MultiAgentState) -> dict:
     """Supervisor agent that routes tasks to specialized agents."""
-    system_prompt = """You are a supervisor managing a team of agents.
-    Based on the conversation, decide which agent should handle the next step.
-    Available agents: researcher, writer
-    Respond with just the agent name, or 'FINISH' if the task is complete."""
+    decision = await router.route(state)
+    update = {"next_agent": decision.agent, "hops": state.get("hops", 0) + 1}
+    if decision.agent == FINISH:
+        update["task_complete"] = True
+    return update
+
 
-    messages = [SystemMessage(content=system_prompt)] + state["messages"]
-    response = llm.invoke(messages)
-    next_agent = response.content.strip().lower()
+async def researcher(state: MultiAgentState) -> dict:
+    """Research planner that splits the request into independent subtasks."""
+    system_prompt = f"""You are a research lead. Split the user's request into at most
+    {MAX_SUBTASKS} independent research subtasks that can be investigated in parallel.
+    Reply with one subtask per line and nothing else. A simple request is one subtask."""
 
-    if next_agent == "finish":
-        return {"next_agent": "FINISH", "task_complete": True}
-    return {"next_agent": next_agent}
+    response = await llm.ainvoke([SystemMessage(content=system_prompt), HumanMessage(content=_request(state))])
+    lines = (re.sub(r"^\s*(?:[-*\u2022]|\d+[.)])\s*", "", line).strip() for line in response.content.splitlines())
+    subtasks = [line for line in lines if line][:MAX_SUBTASKS]
+    return {"subtasks": subtasks or [_request(state)]}
 
 
-def researcher(state: MultiAgentState) -> dict:
-    """Research agent that gathers information."""
+def dispatch_research(state: MultiAgentState) -> list:
+    """Send each subtask to its own research worker; they run in parallel."""
+    request = _request(state)
+    return [Send("research_worker", {"index": index, "task": task, "request": request})
+            for index, task in enumerate(state["subtasks"])]
+
+
+async def research_worker(task: ResearchTask) -> dict:
+    """Research agent that gathers information for one subtask."""
     system_prompt = """You are a research agent. Gather and analyze information
-    based on the user's request. Provide detailed findings."""
+    for your subtask of the user's request. Provide detailed findings."""
+
+    prompt = f"Request: {task['request']}\n\nYour subtask: {task['task']}"
+    async with _research_slot():
+        response = await llm.ainvoke([SystemMessage(content=system_prompt), HumanMessage(content=prompt)])
+    return {"findings": [{"index": task["index"], "task": task["task"], "result": response.content}]}
+
 
-    messages = [SystemMessage(content=system_prompt)] + state["messages"]
-    response = llm.invoke(messages)
-    return {"messages": [AIMessage(content=f"[Researcher] {response.content}")]}
+async def merge_research(state: MultiAgentState) -> dict:
+    """Fold the workers' findings into one researcher message for the writer."""
+    findings = sorted(state["findings"], key=lambda finding: finding["index"])
+    if len(findings) == 1:
+        content = findings[0]["result"]
+    else:
+        content = "\n\n".join(f"## {finding['task']}\n{finding['result']}" for finding in findings)
+    reply = AIMessage(content=f"[Researcher] {content}", name="researcher")
+    return {"messages": [reply], "findings": []}
 
 
-def writer(state: MultiAgentState) -> dict:
+async def writer(state: MultiAgentState) -> dict:
     """Writer agent that creates content."""
     system_prompt = """You are a writing agent. Create well-structured content
     based on the research and user requirements."""
 
-    messages = [SystemMessage(content=system_prompt)] + state["messages"]
-    response = llm.invoke(messages)
-    return {"messages": [AIMessage(content=f"[Writer] {response.content}")]}
+    update, messages = await compactor.compact(state, system_prompt)
+    response = await llm.ainvoke(messages)
+    reply = AIMessage(content=f"[Writer] {response.content}", name="writer")
+    return {**update, "messages": update.get("messages", []) + [reply]}
@@ -0,0 +1,140 @@
+import re
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+
+from .llm import INTERNAL_TAG
+
+FINISH = "FINISH"
+
+ROUTER_PROMPT = """You are a supervisor managing a team of agents.
+Based on the conversation, decide which agent should handle the next step.
+
+Available agents:
+{agents}
+
+Respond with just the agent name, or FINISH if the task is complete."""
+
+
+class Decision(NamedTuple):
+    """A routing decision: the next agent (or FINISH), its confidence and who made it."""
+    agent: str
+    confidence: float
+    source: str
+
+
+def latest_request(messages: Sequence[BaseMessage]) -> int:
+    """Return the index of the latest user message, or -1 if there is none."""
+    for index in range(len(messages) - 1, -1, -1):
+        if isinstance(messages[index], HumanMessage):
+            return index
+    return -1
+
+
+class KeywordRouter:
+    """Deterministic router for agents that run as a fixed pipeline.
+
+    `keywords` maps each agent, in pipeline order, to words that call for
+    it. The latest user request selects the agents whose keywords it
+    mentions (or every agent if it mentions none); those agents then run
+    once each, in order, and the router finishes after the last one. The
+    first hop of a request without keyword matches is a guess and gets
+    `default_confidence`; every other decision gets `confidence`.
+    """
+
+    def __init__(self, keywords: Dict[str, Sequence[str]], confidence: float = 0.9,
+                 default_confidence: float = 0.5):
+        self.order = list(keywords)
+        self.patterns = {
+            name: re.compile(r"\b(?:" + "|".join(re.escape(word) for word in words) + r")", re.IGNORECASE)
+            for name, words in keywords.items()
+        }
+        self.confidence = confidence
+        self.default_confidence = default_confidence
+
+    def __call__(self, state: dict) -> Optional[Decision]:
+        messages = state["messages"]
+        index = latest_request(messages)
+        if index < 0:
+            return None
+        request = messages[index].content
+        request = request if isinstance(request, str) else str(request)
+        replied = {message.name for message in messages[index + 1:] if message.type == "ai"}
+
+        matched = [name for name in self.order if self.patterns[name].search(request)]
+        confidence = self.confidence if matched or replied else self.default_confidence
+        for name in matched or self.order:
+            if name not in replied:
+                return Decision(name, confidence, "rules")
+        return Decision(FINISH, confidence, "rules")
+
+
+class Router:
+    """Pick the next agent, asking the LLM only when cheaper routers are unsure.
+
+    `routers` are called in order with the state and return a Decision or
+    None; the first valid decision with at least `threshold` confidence
+    wins. Otherwise the LLM chooses from a trimmed transcript (the summary
+    plus the last `max_messages` messages, each cut to `max_chars`). Every
+    answer is checked against the registered `agents`: an unknown name
+    falls back to the best rule-based guess, or FINISH. After `max_hops`
+    decisions the run finishes regardless.
+    """
+
+    def __init__(self, llm, agents: Dict[str, str], routers: Sequence[Callable[[dict], Optional[Decision]]] = (),
+                 threshold: float = 0.7, max_hops: int = 10, max_messages: int = 6, max_chars: int = 500):
+        self.llm = llm
+        self.agents = agents
+        self.routers = list(routers)
+        self.threshold = threshold
+        self.max_hops = max_hops
+        self.max_messages = max_messages
+        self.max_chars = max_chars
+
+    def is_valid(self, agent: str) -> bool:
+        return agent == FINISH or agent in self.agents
+
+    async def route(self, state: dict) -> Decision:
+        if state.get("hops", 0) >= self.max_hops:
+            return Decision(FINISH, 1.0, "budget")
+
+        best = None
+        for router in self.routers:
+            decision = router(state)
+            if decision is None or not self.is_valid(decision.agent):
+                continue
+            if decision.confidence >= self.threshold:
+                return decision
+            if best is None or decision.confidence > best.confidence:
+                best = decision
+
+        agent = self.parse(await self.ask(state))
+        if agent is not None:
+            return Decision(agent, self.threshold, "llm")
+        return best or Decision(FINISH, 0.0, "fallback")
+
+    async def ask(self, state: dict) -> str:
+        agents = "\n".join(f"- {name}: {description}" for name, description in self.agents.items())
+        lines = []
+        if state.get("summary"):
+            lines.append(f"Summary of the earlier conversation: {state['summary']}")
+        for message in state["messages"][-self.max_messages:]:
+            content = message.content if isinstance(message.content, str) else str(message.content)
+            if len(content) > self.max_chars:
+                content = content[:self.max_chars] + "..."
+            lines.append(f"{message.name or message.type}: {content}")
+        prompt: List[BaseMessage] = [
+            SystemMessage(content=ROUTER_PROMPT.format(agents=agents)),
+            HumanMessage(content="\n\n".join(lines)),
+        ]
+        response = await self.llm.ainvoke(prompt, {"tags": [INTERNAL_TAG]})
+        return response.content if isinstance(response.content, str) else str(response.content)
+
+    def parse(self, text: str) -> Optional[str]:
+        """Return the first registered agent (or FINISH) named in `text`."""
+        for word in re.findall(r"\w+", text.lower()):
+            if word == "finish":
+                return FINISH
+            if word in self.agents:
+                return word
+        return None
@@ -1,9 +1,52 @@
-from typing import Annotated, TypedDict, Literal
+from typing import Annotated, List, TypedDict, Literal
+from langchain_core.messages import HumanMessage
 from langgraph.graph.message import add_messages
 
 
+def merge_findings(current: list, new: list) -> list:
+    """Collect findings from parallel research workers; an empty update clears them."""
+    if not new:
+        return []
+    return (current or []) + new
+
+
 class MultiAgentState(TypedDict):
     """State for the multi-agent system."""
     messages: Annotated[list, add_messages]
+    summary: str
     next_agent: str
+    hops: int
+    subtasks: List[str]
+    findings: Annotated[list, merge_findings]
     task_complete: bool
+
+
+class ResearchTask(TypedDict):
+    """Input sent to one research worker."""
+    index: int
+    task: str
+    request: str
+
+
+def initial_state(prompt: str) -> MultiAgentState:
+    """Build the graph input for a single user prompt."""
+    return {
+        "messages": [HumanMessage(content=prompt)],
+        "summary": "",
+        "next_agent": "supervisor",
+        "hops": 0,
+        "subtasks": [],
+        "findings": [],
+        "task_complete": False
+    }
+
+
+def follow_up_state(prompt: str) -> MultiAgentState:
+    """Build the graph input for a new prompt on an existing thread.
+
+    Like `initial_state()`, but leaves the thread's rolling summary alone:
+    the messages it condenses have already been removed from the state.
+    """
+    state = initial_state(prompt)
+    del state["summary"]
+    return state
@@ -1,3 +1,5 @@
 from .graph import create_agent
+from .state import follow_up_state, initial_state
+from .batch import run_batch
 
-__all__ = ["create_agent"]
+__all__ = ["create_agent", "follow_up_state", "initial_state", "run_batch"]
@@ -0,0 +1,328 @@
+import asyncio
+import random
+import sqlite3
+import threading
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+
+DEFAULT_CHECKPOINT_PATH = ".checkpoints.sqlite"
+
+# A list channel is stored as a full snapshot after this many deltas in a row
+SNAPSHOT_EVERY = 64
+
+# Checkpoints written to a thread between automatic compactions
+COMPACT_EVERY = 100
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    type TEXT,
+    checkpoint BLOB,
+    metadata_type TEXT,
+    metadata BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+);
+CREATE TABLE IF NOT EXISTS blobs (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    channel TEXT NOT NULL,
+    version TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    type TEXT,
+    blob BLOB,
+    base TEXT,
+    depth INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (thread_id, checkpoint_ns, channel, version)
+);
+CREATE TABLE IF NOT EXISTS writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    task_path TEXT NOT NULL DEFAULT '',
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    type TEXT,
+    blob BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+"""
+
+# Follows a delta's `base` pointers back to the nearest snapshot, newest first
+CHAIN_QUERY = """
+WITH RECURSIVE chain(version, kind, type, blob, base, n) AS (
+    SELECT version, kind, type, blob, base, 0 FROM blobs
+    WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?
+    UNION ALL
+    SELECT b.version, b.kind, b.type, b.blob, b.base, chain.n + 1 FROM blobs b JOIN chain
+    ON b.thread_id = ? AND b.checkpoint_ns = ? AND b.channel = ? AND b.version = chain.base
+    WHERE chain.kind = 'delta'
+)
+SELECT kind, type, blob FROM chain ORDER BY n DESC
+"""
+
+
+def _same(a: Any, b: Any) -> bool:
+    return a is b or a == b
+
+
+class SqliteDeltaSaver(BaseCheckpointSaver[str]):
+    """Checkpointer that persists graph state to a local SQLite file (WAL mode).
+
+    Like LangGraph's own savers, only channels that changed in a step are
+    written. On top of that, a list channel (such as `messages`) that grew by
+    appending is stored as a delta holding just the new items, pointing at
+    the previous version. Step cost stays constant as a thread grows. Every
+    `SNAPSHOT_EVERY` deltas, or whenever a list is edited rather than
+    appended to (e.g. by `RemoveMessage`), the full value is stored instead,
+    which bounds the chain a read has to replay.
+
+    Every `COMPACT_EVERY` checkpoints, threads are compacted down to their
+    latest `keep_checkpoints` checkpoints (None keeps the full history).
+    Resume a thread by invoking the graph with the same `thread_id`.
+    """
+
+    def __init__(self, path: str = DEFAULT_CHECKPOINT_PATH, keep_checkpoints: Optional[int] = 50,
+                 *, serde=None):
+        super().__init__(serde=serde)
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.lock = threading.Lock()
+        self.keep_checkpoints = keep_checkpoints
+        # Last stored value of each list channel: (thread, ns, channel) -> (version, items, depth)
+        self._latest: Dict[Tuple[str, str, str], Tuple[str, list, int]] = {}
+        self._puts: Dict[str, int] = {}
+
+    # -- blobs ---------------------------------------------------------------
+
+    def _put_blob(self, thread_id: str, ns: str, channel: str, version: str, values: dict) -> None:
+        key = (thread_id, ns, channel)
+        if channel not in values:
+            self._latest.pop(key, None)
+            row = ("empty", None, None, None, 0)
+        else:
+            value = values[channel]
+            previous = self._latest.get(key) if isinstance(value, list) else None
+            if (previous is not None and previous[2] < SNAPSHOT_EVERY
+                    and len(value) >= len(previous[1])
+                    and all(_same(a, b) for a, b in zip(previous[1], value))):
+                base, items, depth = previous
+                row = ("delta", *self.serde.dumps_typed(value[len(items):]), base, depth + 1)
+            else:
+                row = ("snapshot", *self.serde.dumps_typed(value), None, 0)
+            if isinstance(value, list):
+                self._latest[key] = (version, list(value), row[4])
+        self.conn.execute(
+            "INSERT OR REPLACE INTO blobs (thread_id, checkpoint_ns, channel, version, kind, type, blob, base, depth) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", (thread_id, ns, channel, version, *row))
+
+    def _load_blob(self, thread_id: str, ns: str, channel: str, version: str) -> Tuple[bool, Any]:
+        key = (thread_id, ns, channel)
+        cached = self._latest.get(key)
+        if cached is not None and cached[0] == version:
+            return True, list(cached[1])
+        rows = self.conn.execute(CHAIN_QUERY, (thread_id, ns, channel, version, thread_id, ns, channel)).fetchall()
+        # Missing, explicitly empty, or a delta whose chain no longer reaches a snapshot
+        if not rows or rows[0][0] != "snapshot":
+            return False, None
+        value = self.serde.loads_typed((rows[0][1], rows[0][2]))
+        for kind, type_, blob in rows[1:]:
+            value = value + self.serde.loads_typed((type_, blob))
+        if isinstance(value, list):
+            self._latest[key] = (version, list(value), len(rows) - 1)
+        return True, value
+
+    # -- checkpoints ---------------------------------------------------------
+
+    def _tuple(self, thread_id: str, ns: str, row: tuple) -> CheckpointTuple:
+        checkpoint_id, parent_id, type_, blob, metadata_type, metadata = row
+        checkpoint = self.serde.loads_typed((type_, blob))
+        values = {}
+        for channel, version in checkpoint["channel_versions"].items():
+            found, value = self._load_blob(thread_id, ns, channel, str(version))
+            if found:
+                values[channel] = value
+        writes = self.conn.execute(
+            "SELECT task_id, channel, type, blob FROM writes "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? ORDER BY task_path, task_id, idx",
+            (thread_id, ns, checkpoint_id)).fetchall()
+
+        def config(id_):
+            return {"configurable": {"thread_id": thread_id, "checkpoint_ns": ns, "checkpoint_id": id_}}
+
+        return CheckpointTuple(
+            config=config(checkpoint_id),
+            checkpoint={**checkpoint, "channel_values": values},
+            metadata=self.serde.loads_typed((metadata_type, metadata)),
+            parent_config=config(parent_id) if parent_id else None,
+            pending_writes=[(task_id, channel, self.serde.loads_typed((t, b))) for task_id, channel, t, b in writes],
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        ns = config["configurable"].get("checkpoint_ns", "")
+        query = ("SELECT checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata_type, metadata "
+                 "FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?")
+        with self.lock:
+            if checkpoint_id := get_checkpoint_id(config):
+                row = self.conn.execute(query + " AND checkpoint_id = ?", (thread_id, ns, checkpoint_id)).fetchone()
+            else:
+                row = self.conn.execute(query + " ORDER BY checkpoint_id DESC LIMIT 1", (thread_id, ns)).fetchone()
+            return self._tuple(thread_id, ns, row) if row else None
+
+    def list(self, config: Optional[RunnableConfig], *, filter: Optional[Dict[str, Any]] = None,
+             before: Optional[RunnableConfig] = None, limit: Optional[int] = None) -> Iterator[CheckpointTuple]:
+        query = ("SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, "
+                 "metadata_type, metadata FROM checkpoints WHERE 1 = 1")
+        params = []
+        if config:
+            query += " AND thread_id = ?"
+            params.append(config["configurable"]["thread_id"])
+            if "checkpoint_ns" in config["configurable"]:
+                query += " AND checkpoint_ns = ?"
+                params.append(config["configurable"]["checkpoint_ns"])
+            if checkpoint_id := get_checkpoint_id(config):
+                query += " AND checkpoint_id = ?"
+                params.append(checkpoint_id)
+        if before and (before_id := get_checkpoint_id(before)):
+            query += " AND checkpoint_id < ?"
+            params.append(before_id)
+        query += " ORDER BY checkpoint_id DESC"
+        with self.lock:
+            rows = self.conn.execute(query, params).fetchall()
+        count = 0
+        for thread_id, ns, *row in rows:
+            if limit is not None and count >= limit:
+                return
+            with self.lock:
+                result = self._tuple(thread_id, ns, tuple(row))
+            if filter and not all(result.metadata.get(k) == v for k, v in filter.items()):
+                continue
+            count += 1
+            yield result
+
+    def put(self, config: RunnableConfig, checkpoint: Checkpoint, metadata: CheckpointMetadata,
+            new_versions: ChannelVersions) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        ns = config["configurable"].get("checkpoint_ns", "")
+        stored = checkpoint.copy()
+        values = stored.pop("channel_values")
+        with self.lock, self.conn:
+            self.conn.execute("BEGIN")
+            for channel, version in new_versions.items():
+                self._put_blob(thread_id, ns, channel, str(version), values)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (thread_id, ns, checkpoint["id"], config["configurable"].get("checkpoint_id"),
+                 *self.serde.dumps_typed(stored),
+                 *self.serde.dumps_typed(get_checkpoint_metadata(config, metadata))))
+        self._puts[thread_id] = self._puts.get(thread_id, 0) + 1
+        if self.keep_checkpoints is not None and self._puts[thread_id] % COMPACT_EVERY == 0:
+            self.compact(thread_id, self.keep_checkpoints)
+        return {"configurable": {"thread_id": thread_id, "checkpoint_ns": ns, "checkpoint_id": checkpoint["id"]}}
+
+    def put_writes(self, config: RunnableConfig, writes: Sequence[Tuple[str, Any]], task_id: str,
+                   task_path: str = "") -> None:
+        thread_id = config["configurable"]["thread_id"]
+        ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        # Special channels (errors, interrupts) replace earlier writes; the rest are written once
+        verb = "INSERT OR REPLACE" if all(w[0] in WRITES_IDX_MAP for w in writes) else "INSERT OR IGNORE"
+        rows = [(thread_id, ns, checkpoint_id, task_id, task_path, WRITES_IDX_MAP.get(channel, idx), channel,
+                 *self.serde.dumps_typed(value)) for idx, (channel, value) in enumerate(writes)]
+        with self.lock, self.conn:
+            self.conn.execute("BEGIN")
+            self.conn.executemany(f"{verb} INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self.lock, self.conn:
+            self.conn.execute("BEGIN")
+            for table in ("checkpoints", "blobs", "writes"):
+                self.conn.execute(f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,))
+            self._latest = {k: v for k, v in self._latest.items() if k[0] != thread_id}
+
+    def compact(self, thread_id: str, keep: int = 50) -> None:
+        """Drop all but the latest `keep` checkpoints of a thread, with their writes and blobs.
+
+        Blobs that a kept checkpoint still needs, including the base chain of
+        its deltas, are preserved. The latest checkpoint is always kept.
+        """
+        keep = max(keep, 1)
+        with self.lock, self.conn:
+            self.conn.execute("BEGIN")
+            for (ns,) in self.conn.execute(
+                    "SELECT DISTINCT checkpoint_ns FROM checkpoints WHERE thread_id = ?", (thread_id,)).fetchall():
+                rows = self.conn.execute(
+                    "SELECT checkpoint_id, type, checkpoint FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? "
+                    "ORDER BY checkpoint_id DESC", (thread_id, ns)).fetchall()
+                if len(rows) <= keep:
+                    continue
+                oldest_kept = rows[keep - 1][0]
+                needed = set()
+                for _, type_, blob in rows[:keep]:
+                    for channel, version in self.serde.loads_typed((type_, blob))["channel_versions"].items():
+                        needed.add((channel, str(version)))
+                bases = dict(((channel, version), base) for channel, version, base in self.conn.execute(
+                    "SELECT channel, version, base FROM blobs WHERE thread_id = ? AND checkpoint_ns = ?",
+                    (thread_id, ns)))
+                pending = list(needed)
+                while pending:
+                    channel, version = pending.pop()
+                    base = bases.get((channel, version))
+                    if base is not None and (channel, base) not in needed:
+                        needed.add((channel, base))
+                        pending.append((channel, base))
+                self.conn.executemany(
+                    "DELETE FROM blobs WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?",
+                    [(thread_id, ns, *key) for key in bases if key not in needed])
+                for table in ("checkpoints", "writes"):
+                    self.conn.execute(
+                        f"DELETE FROM {table} WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id < ?",
+                        (thread_id, ns, oldest_kept))
+
+    def get_next_version(self, current: Optional[str], channel: None = None) -> str:
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+    # -- async ---------------------------------------------------------------
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(self, config: Optional[RunnableConfig], *, filter: Optional[Dict[str, Any]] = None,
+                    before: Optional[RunnableConfig] = None, limit: Optional[int] = None) -> AsyncIterator[CheckpointTuple]:
+        results = await asyncio.to_thread(lambda: list(self.list(config, filter=filter, before=before, limit=limit)))
+        for result in results:
+            yield result
+
+    async def aput(self, config: RunnableConfig, checkpoint: Checkpoint, metadata: CheckpointMetadata,
+                   new_versions: ChannelVersions) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config: RunnableConfig, writes: Sequence[Tuple[str, Any]], task_id: str,
+                          task_path: str = "") -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
@@ -0,0 +1,76 @@
+import asyncio
+import weakref
+from typing import Dict, Optional, Sequence
+
+from langchain_core.messages import ToolMessage
+from langchain_core.tools import BaseTool
+
+from .state import AgentState
+
+
+class ToolExecutor:
+    """Graph node that runs every tool call of the last AI message concurrently.
+
+    Step latency is that of the slowest call rather than the sum. Each call
+    is bounded by a timeout (`timeouts` overrides `timeout` per tool name),
+    at most `max_concurrency` calls run at once across all runs of the graph,
+    and `limits` caps individual tools (e.g. `{"search": 2}`). Results come
+    back in call order. Failures and timeouts are returned to the model as
+    error messages (`status="error"`) instead of aborting the run.
+
+    Sync tools run on the default thread pool; a timed-out sync tool is
+    abandoned, not interrupted.
+    """
+
+    def __init__(self, tools: Sequence[BaseTool], timeout: float = 30.0,
+                 timeouts: Optional[Dict[str, float]] = None, max_concurrency: int = 8,
+                 limits: Optional[Dict[str, int]] = None):
+        self.tools = {tool.name: tool for tool in tools}
+        self.timeout = timeout
+        self.timeouts = timeouts or {}
+        self.max_concurrency = max_concurrency
+        self.limits = limits or {}
+        # Semaphores are bound to an event loop, so keep one set per loop
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    def _semaphores_for_loop(self):
+        loop = asyncio.get_running_loop()
+        if loop not in self._semaphores:
+            self._semaphores[loop] = (
+                asyncio.Semaphore(self.max_concurrency),
+                {name: asyncio.Semaphore(limit) for name, limit in self.limits.items()},
+            )
+        return self._semaphores[loop]
+
+    async def __call__(self, state: AgentState) -> dict:
+        calls = state["messages"][-1].tool_calls
+        results = await asyncio.gather(*(self._run(call) for call in calls))
+        return {"messages": list(results)}
+
+    async def _run(self, call: dict) -> ToolMessage:
+        name = call["name"]
+        tool = self.tools.get(name)
+        if tool is None:
+            return ToolMessage(content=f"Error: unknown tool {name!r}", name=name,
+                               tool_call_id=call["id"], status="error")
+
+        shared, per_tool = self._semaphores_for_loop()
+        timeout = self.timeouts.get(name, self.timeout)
+        # Wait for the tool's own limit first, so calls queued behind a
+        # saturated tool don't hold shared slots other tools could use
+        limit = per_tool.get(name)
+        if limit is not None:
+            await limit.acquire()
+        status = "success"
+        try:
+            async with shared:
+                output = await asyncio.wait_for(tool.ainvoke(call["args"]), timeout)
+                content = output if isinstance(output, str) else str(output)
+        except asyncio.TimeoutError:
+            content, status = f"Error: {name} timed out after {timeout:g}s", "error"
+        except Exception as e:
+            content, status = f"Error: {e}", "error"
+        finally:
+            if limit is not None:
+                limit.release()
+        return ToolMessage(content=content, name=name, tool_call_id=call["id"], status=status)
@@ -0,0 +1,254 @@
+import ast
+import math
+import time
+from functools import lru_cache, wraps
+from typing import Dict, List, Optional, Sequence, Union
+
+Number = Union[int, float]
+
+# Longest expression accepted, in characters
+MAX_LENGTH = 2000
+
+# Largest integer (in bits) an operation may produce; keeps 9**9**9 from hanging
+MAX_INT_BITS = 4096
+
+# Largest argument accepted by factorial/comb/perm
+MAX_FACTORIAL = 1000
+
+# Most elements an array expression may produce
+MAX_ARRAY_LENGTH = 100_000
+
+# Wall-clock budget, in seconds, for one evaluate() or evaluate_many() call
+MAX_EVAL_SECONDS = 1.0
+
+CONSTANTS = {"pi": math.pi, "e": math.e, "tau": math.tau, "inf": math.inf}
+
+
+class ExpressionError(ValueError):
+    """Raised for expressions that are malformed, disallowed or too large."""
+
+
+def _check_int(value):
+    if isinstance(value, int) and value.bit_length() > MAX_INT_BITS:
+        raise ExpressionError(f"result exceeds {MAX_INT_BITS} bits")
+    return value
+
+
+def _pow(base, exponent):
+    if isinstance(base, int) and isinstance(exponent, int) and exponent > 0 and abs(base) > 1:
+        # |base| >= 2**(bit_length - 1), so this is a lower bound on the result's size
+        if exponent * (abs(base).bit_length() - 1) >= MAX_INT_BITS:
+            raise ExpressionError(f"result exceeds {MAX_INT_BITS} bits")
+    result = base ** exponent
+    if isinstance(result, complex):
+        # e.g. (-8)**(1/3); sqrt(-1) is an error too
+        raise ExpressionError("result is not a real number")
+    return _check_int(result)
+
+
+def _mul(left, right):
+    if isinstance(left, int) and isinstance(right, int):
+        if left.bit_length() + right.bit_length() > MAX_INT_BITS + 1:
+            raise ExpressionError(f"result exceeds {MAX_INT_BITS} bits")
+    return left * right
+
+
+def _checked(func):
+    """Apply the integer size limit to a function's result (e.g. lcm, comb)."""
+    @wraps(func)
+    def wrapper(*args):
+        return _check_int(func(*args))
+    return wrapper
+
+
+def _bounded(func):
+    def wrapper(*args):
+        if any(isinstance(arg, int) and arg > MAX_FACTORIAL for arg in args):
+            raise ExpressionError(f"{func.__name__}() argument exceeds {MAX_FACTORIAL}")
+        return func(*args)
+    return wrapper
+
+
+FUNCTIONS = {
+    name: getattr(math, name) for name in (
+        "sqrt", "cbrt", "exp", "expm1", "log", "log2", "log10", "log1p",
+        "sin", "cos", "tan", "asin", "acos", "atan", "atan2", "sinh", "cosh", "tanh",
+        "asinh", "acosh", "atanh", "degrees", "radians", "hypot", "floor", "ceil",
+        "trunc", "fabs", "gcd", "lcm", "isqrt", "copysign", "fmod", "erf", "erfc",
+        "gamma", "lgamma",
+    ) if hasattr(math, name)
+}
+FUNCTIONS.update({
+    "factorial": _bounded(math.factorial),
+    "comb": _bounded(math.comb),
+    "perm": _bounded(math.perm),
+    "abs": abs,
+    "round": round,
+    "min": min,
+    "max": max,
+})
+FUNCTIONS = {name: _checked(func) for name, func in FUNCTIONS.items()}
+
+BINARY_OPS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow)
+UNARY_OPS = (ast.UAdd, ast.USub)
+
+# Names the compiled code may see besides the caller's variables
+GLOBALS = {"__builtins__": {}, "_pow": _pow, "_mul": _mul, **FUNCTIONS, **CONSTANTS}
+
+
+class _Checker(ast.NodeTransformer):
+    """Reject anything but arithmetic, and route * and ** through size checks."""
+
+    def __init__(self):
+        self.names = set()
+
+    def generic_visit(self, node):
+        raise ExpressionError(f"{type(node).__name__} is not allowed")
+
+    def visit_Expression(self, node):
+        # A top-level list or tuple evaluates each element
+        if isinstance(node.body, (ast.List, ast.Tuple)):
+            node.body.elts = [self.visit(elt) for elt in node.body.elts]
+        else:
+            node.body = self.visit(node.body)
+        return node
+
+    def visit_Constant(self, node):
+        if type(node.value) not in (int, float):
+            raise ExpressionError(f"constant {node.value!r} is not a number")
+        _check_int(node.value)
+        return node
+
+    def visit_Name(self, node):
+        if node.id.startswith("_"):
+            raise ExpressionError(f"name {node.id!r} is not allowed")
+        if node.id not in FUNCTIONS and node.id not in CONSTANTS:
+            self.names.add(node.id)
+        return node
+
+    def visit_UnaryOp(self, node):
+        if not isinstance(node.op, UNARY_OPS):
+            raise ExpressionError(f"operator {type(node.op).__name__} is not allowed")
+        node.operand = self.visit(node.operand)
+        return node
+
+    def visit_BinOp(self, node):
+        if not isinstance(node.op, BINARY_OPS):
+            raise ExpressionError(f"operator {type(node.op).__name__} is not allowed")
+        left, right = self.visit(node.left), self.visit(node.right)
+        if isinstance(node.op, (ast.Pow, ast.Mult)):
+            func = "_pow" if isinstance(node.op, ast.Pow) else "_mul"
+            return ast.copy_location(
+                ast.Call(func=ast.Name(id=func, ctx=ast.Load()), args=[left, right], keywords=[]), node)
+        node.left, node.right = left, right
+        return node
+
+    def visit_Call(self, node):
+        if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS:
+            raise ExpressionError("only math functions may be called")
+        if node.keywords:
+            raise ExpressionError("keyword arguments are not allowed")
+        node.args = [self.visit(arg) for arg in node.args]
+        return node
+
+
+class CompiledExpression:
+    """An expression validated and compiled once, evaluable many times."""
+
+    def __init__(self, source: str):
+        if len(source) > MAX_LENGTH:
+            raise ExpressionError(f"expression longer than {MAX_LENGTH} characters")
+        checker = _Checker()
+        try:
+            tree = ast.parse(source.strip(), mode="eval")
+            tree = ast.fix_missing_locations(checker.visit(tree))
+            self.code = compile(tree, "<expression>", "eval")
+        except SyntaxError as e:
+            raise ExpressionError(f"invalid syntax: {e.msg}") from None
+        except (RecursionError, MemoryError):
+            # Long chains like 1+1+...+1 nest one level per operator
+            raise ExpressionError("expression is nested too deeply") from None
+        self.source = source
+        self.names = frozenset(checker.names)
+
+    def __call__(self, variables: Optional[Dict[str, Number]] = None):
+        missing = self.names - set(variables or ())
+        if missing:
+            raise ExpressionError(f"unknown name(s): {', '.join(sorted(missing))}")
+        try:
+            result = eval(self.code, GLOBALS, variables or {})
+        except ExpressionError:
+            raise
+        except OverflowError:
+            raise ExpressionError("result out of range") from None
+        except (RecursionError, MemoryError):
+            raise ExpressionError("expression is nested too deeply") from None
+        except (ArithmeticError, ValueError, TypeError) as e:
+            raise ExpressionError(str(e)) from None
+        if isinstance(result, (list, tuple)):
+            return [_check_int(value) for value in result]
+        return _check_int(result)
+
+
+@lru_cache(maxsize=1024)
+def compile_expression(source: str) -> CompiledExpression:
+    """Parse, validate and compile `source`, reusing earlier compilations."""
+    return CompiledExpression(source)
+
+
+def evaluate(source: str, variables: Optional[Dict[str, Union[Number, Sequence[Number]]]] = None,
+             timeout: float = MAX_EVAL_SECONDS):
+    """Evaluate an arithmetic expression.
+
+    Variables may be numbers or equal-length lists of numbers; with lists the
+    expression is evaluated elementwise (numbers broadcast) and a list is
+    returned. `[expr, expr, ...]` evaluates several expressions at once.
+    Raises ExpressionError once evaluation has run for `timeout` seconds.
+    """
+    deadline = time.monotonic() + timeout
+    expression = compile_expression(source)
+    variables = variables or {}
+    for name, value in variables.items():
+        values = value if isinstance(value, (list, tuple)) else (value,)
+        if not all(type(v) in (int, float) for v in values):
+            raise ExpressionError(f"variable {name!r} must be a number or a list of numbers")
+    arrays = {name: value for name, value in variables.items()
+              if name in expression.names and isinstance(value, (list, tuple))}
+    if not arrays:
+        return expression(variables)
+
+    lengths = {len(value) for value in arrays.values()}
+    if len(lengths) != 1:
+        raise ExpressionError("array variables must have the same length")
+    length = lengths.pop()
+    if length > MAX_ARRAY_LENGTH:
+        raise ExpressionError(f"arrays longer than {MAX_ARRAY_LENGTH} elements")
+    scope = dict(variables)
+    results = []
+    for i in range(length):
+        if time.monotonic() > deadline:
+            raise ExpressionError("evaluation time limit exceeded")
+        for name, value in arrays.items():
+            scope[name] = value[i]
+        results.append(expression(scope))
+    return results
+
+
+def evaluate_many(sources: Sequence[str], variables: Optional[Dict[str, Number]] = None,
+                  timeout: float = MAX_EVAL_SECONDS) -> List:
+    """Evaluate several expressions, returning a result or an ExpressionError for each.
+
+    `timeout` bounds the whole batch; expressions left when it runs out fail.
+    """
+    deadline = time.monotonic() + timeout
+    results = []
+    for source in sources:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            results.append(ExpressionError("evaluation time limit exceeded"))
+            continue
+        try:
+            results.append(evaluate(source, variables, remaining))
+        except ExpressionError as e:
+            results.append(e)
+    return results
@@ -1,25 +1,32 @@
-import os
 from langgraph.graph import StateGraph, END
-from langgraph.prebuilt import ToolNode
-from langchain_openai import ChatOpenAI
 
+from .executor import ToolExecutor
+from .llm import DEFAULT_MODEL, get_llm
+from .memory import HistoryCompactor
 from .state import AgentState
 from .tools import TOOLS
 
 
-def create_agent(model: str = "anthropic/claude-3.5-sonnet"):
-    """Create a ReAct agent with the specified model."""
+def create_agent(model: str = DEFAULT_MODEL, tool_timeout: float = 30.0,
+                 max_tool_concurrency: int = 8, max_history_tokens: int = 8000, checkpointer=None):
+    """Create a ReAct agent with the specified model.
 
-    llm = ChatOpenAI(
-        base_url="https://openrouter.ai/api/v1",
-        api_key=os.getenv("OPENROUTER_API_KEY"),
-        model=model
-    )
+    Tool calls from one model turn run concurrently, each limited to
+    `tool_timeout` seconds, with at most `max_tool_concurrency` in flight.
+    History beyond `max_history_tokens` is folded into a rolling summary.
+    Pass a `checkpointer` (e.g. `SqliteDeltaSaver()`) to persist and resume
+    threads.
+    """
+
+    # Shared with every other agent using this model
+    llm = get_llm(model)
     llm_with_tools = llm.bind_tools(TOOLS)
+    compactor = HistoryCompactor(llm, max_tokens=max_history_tokens)
 
-    def agent_node(state: AgentState):
-        response = llm_with_tools.invoke(state["messages"])
-        return {"messages": [response]}
+    async def agent_node(state: AgentState):
+        update, messages = await compactor.compact(state)
+        response = await llm_with_tools.ainvoke(messages)
+        return {**update, "messages": update.get("messages", []) + [response]}
 
     def should_continue(state: AgentState):
         last_message = state["messages"][-1]
@@ -30,9 +37,9 @@ def create_agent(model: str = "anthropic/claude-3.5-sonnet"):
     # Build graph
     graph = StateGraph(AgentState)
     graph.add_node("agent", agent_node)
-    graph.add_node("tools", ToolNode(TOOLS))
+    graph.add_node("tools", ToolExecutor(TOOLS, timeout=tool_timeout, max_concurrency=max_tool_concurrency))
     graph.set_entry_point("agent")
     graph.add_conditional_edges("agent", should_continue, {"tools": "tools", END: END})
     graph.add_edge("tools", "agent")
 
-    return graph.compile()
+    return graph.compile(checkpointer=checkpointer)
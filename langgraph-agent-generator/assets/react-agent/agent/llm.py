@@ -0,0 +1,110 @@
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+DEFAULT_BASE_URL = "https://openrouter.ai/api/v1"
+DEFAULT_MODEL = "anthropic/claude-3.5-sonnet"
+
+# Connection pool shared by every client for one (base_url, model)
+MAX_CONNECTIONS = 100
+MAX_KEEPALIVE_CONNECTIONS = 20
+KEEPALIVE_EXPIRY = 60.0
+TIMEOUT = 120.0
+
+# Tag for bookkeeping calls (routing, summaries) whose tokens aren't part of
+# the answer; `main.py --stream` leaves them out
+INTERNAL_TAG = "internal"
+
+_lock = threading.Lock()
+_pools: Dict[Tuple[str, str], tuple] = {}
+_clients: Dict[tuple, Any] = {}
+_override = None
+_rate_limiter = None
+
+
+def get_rate_limiter():
+    """Return the process-wide token-bucket rate limiter, or None if LLM_RATE_LIMIT=off.
+
+    LLM_RATE_LIMIT is the sustained rate in requests per second (default 8);
+    bursts of up to twice that are allowed. Every client from `get_llm()`
+    draws from the same bucket, and cache hits don't consume tokens.
+    """
+    global _rate_limiter
+    rate = os.getenv("LLM_RATE_LIMIT", "8").lower()
+    if rate in ("0", "off", "false", "no"):
+        return None
+    if _rate_limiter is None:
+        from langchain_core.rate_limiters import InMemoryRateLimiter
+
+        requests_per_second = float(rate)
+        _rate_limiter = InMemoryRateLimiter(requests_per_second=requests_per_second,
+                                            check_every_n_seconds=min(0.1, 1 / requests_per_second),
+                                            max_bucket_size=max(1.0, 2 * requests_per_second))
+    return _rate_limiter
+
+
+def _http_clients(base_url: str, model: str) -> tuple:
+    """Return the (sync, async) keep-alive httpx clients for one base URL and model."""
+    key = (base_url, model)
+    if key not in _pools:
+        import httpx
+
+        limits = httpx.Limits(max_connections=MAX_CONNECTIONS,
+                              max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                              keepalive_expiry=KEEPALIVE_EXPIRY)
+        _pools[key] = (httpx.Client(limits=limits, timeout=TIMEOUT),
+                       httpx.AsyncClient(limits=limits, timeout=TIMEOUT))
+    return _pools[key]
+
+
+def get_llm(model: str = DEFAULT_MODEL, base_url: str = DEFAULT_BASE_URL, **kwargs):
+    """Return the shared chat client for `model`, building it on first use.
+
+    Clients are cached per (base_url, model, kwargs), and all clients for
+    one (base_url, model) share a connection pool, so many graphs in one
+    process reuse the same connections. langchain_openai is only imported
+    here, which keeps `import agent` fast. Every client gets the response
+    cache and the shared rate limiter.
+    """
+    if _override is not None:
+        return _override
+    key = (base_url, model, tuple(sorted(kwargs.items())))
+    with _lock:
+        if key not in _clients:
+            from langchain_openai import ChatOpenAI
+
+            from .cache import get_cache
+
+            http_client, http_async_client = _http_clients(base_url, model)
+            _clients[key] = ChatOpenAI(
+                base_url=base_url,
+                api_key=os.getenv("OPENROUTER_API_KEY"),
+                model=model,
+                cache=get_cache(),
+                rate_limiter=get_rate_limiter(),
+                http_client=http_client,
+                http_async_client=http_async_client,
+                **kwargs
+            )
+        return _clients[key]
+
+
+def set_llm(llm: Optional[Any]) -> None:
+    """Make `get_llm()` return `llm` (e.g. a fake model for tests); None restores it."""
+    global _override
+    _override = llm
+
+
+class LazyLLM:
+    """Stand-in for `get_llm(...)` that resolves the client on each use.
+
+    Lets modules define their model at import time without importing
+    langchain_openai or opening connections until a node actually calls it.
+    """
+
+    def __init__(self, model: str = DEFAULT_MODEL, base_url: str = DEFAULT_BASE_URL, **kwargs):
+        self._settings = (model, base_url, kwargs)
+
+    def __getattr__(self, name: str):
+        model, base_url, kwargs = self._settings
+        return getattr(get_llm(model, base_url, **kwargs), name)
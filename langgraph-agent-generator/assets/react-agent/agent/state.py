@@ -1,7 +1,25 @@
 from typing import Annotated, TypedDict
+from langchain_core.messages import HumanMessage
 from langgraph.graph.message import add_messages
 
 
 class AgentState(TypedDict):
     """State for the ReAct agent."""
     messages: Annotated[list, add_messages]
+    summary: str
+
+
+def initial_state(prompt: str) -> AgentState:
+    """Build the graph input for a single user prompt."""
+    return {"messages": [HumanMessage(content=prompt)], "summary": ""}
+
+
+def follow_up_state(prompt: str) -> AgentState:
+    """Build the graph input for a new prompt on an existing thread.
+
+    Like `initial_state()`, but leaves the thread's rolling summary alone:
+    the messages it condenses have already been removed from the state.
+    """
+    state = initial_state(prompt)
+    del state["summary"]
+    return state
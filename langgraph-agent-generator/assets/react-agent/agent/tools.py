@@ -1,5 +1,9 @@
+from typing import Dict, List, Optional, Union
+
 from langchain_core.tools import tool
 
+from .expression import ExpressionError, evaluate
+
 
 @tool
 def search(query: str) -> str:
@@ -9,12 +13,17 @@ def search(query: str) -> str:
 
 
 @tool
-def calculator(expression: str) -> str:
-    """Evaluate a mathematical expression."""
+def calculator(expression: str, variables: Optional[Dict[str, Union[float, List[float]]]] = None) -> str:
+    """Evaluate an arithmetic expression, e.g. `sqrt(2) * 10**3`.
+
+    Supports + - * / // % **, math functions (sqrt, log, sin, factorial, ...)
+    and the constants pi, e, tau. Pass `[expr1, expr2, ...]` to evaluate
+    several expressions at once. Names in `variables` may be numbers or
+    equal-length lists; with lists the expression is evaluated elementwise.
+    """
     try:
-        result = eval(expression)
-        return str(result)
-    except Exception as e:
+        return str(evaluate(expression, variables))
+    except ExpressionError as e:
         return f"Error: {e}"
 
 
@@ -0,0 +1,20 @@
+from typing import Iterable, Optional
+
+from langchain_core.runnables import RunnableConfig
+
+from .graph import create_workflow_agent
+from .state import initial_state
+
+
+async def run_batch(prompts: Iterable[str], app=None, max_concurrency: int = 8,
+                    config: Optional[RunnableConfig] = None) -> list:
+    """Run many prompts through the graph concurrently.
+
+    At most `max_concurrency` runs are in flight at once. Results come back in
+    input order; a failed run is returned as its exception instead of
+    cancelling the rest of the batch.
+    """
+    app = app or create_workflow_agent()
+    config = {**(config or {}), "max_concurrency": max_concurrency}
+    inputs = [initial_state(prompt) for prompt in prompts]
+    return await app.abatch(inputs, config, return_exceptions=True)
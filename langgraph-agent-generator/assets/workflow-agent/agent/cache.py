@@ -0,0 +1,145 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Sequence
+
+from langchain_core.caches import BaseCache, RETURN_VAL_TYPE
+from langchain_core.messages import message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration
+
+DEFAULT_CACHE_PATH = ".llm_cache.sqlite"
+
+# Rows written between eviction sweeps of the SQLite tier
+EVICT_EVERY = 100
+
+
+class TieredCache(BaseCache):
+    """LLM response cache: an in-memory LRU in front of a SQLite file.
+
+    Entries are keyed on the prompt (the serialized messages) and the LLM
+    string, which covers the model, its parameters and any bound tool
+    schemas. Entries expire after `ttl` seconds (None keeps them forever);
+    the memory tier holds at most `max_memory` entries and the SQLite tier at
+    most `max_rows`, dropping the least recently used first.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_memory: int = 1024,
+                 max_rows: int = 100_000, ttl: Optional[float] = 7 * 24 * 3600):
+        self.path = path
+        self.max_memory = max_memory
+        self.max_rows = max_rows
+        self.ttl = ttl
+        self.memory: OrderedDict = OrderedDict()
+        self.lock = threading.Lock()
+        self.conn: Optional[sqlite3.Connection] = None
+        self.writes = 0
+        self.hits = {"memory": 0, "disk": 0}
+        self.misses = 0
+
+    def _db(self) -> sqlite3.Connection:
+        # Opened on first use so importing the agent never touches the disk
+        if self.conn is None:
+            self.conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL, accessed REAL NOT NULL)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache (accessed)")
+        return self.conn
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\0{prompt}".encode()).hexdigest()
+
+    def _remember(self, key: str, expires: Optional[float], value: Sequence) -> None:
+        self.memory[key] = (expires, value)
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_memory:
+            self.memory.popitem(last=False)
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = self._key(prompt, llm_string)
+        now = time.time()
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires is None or expires > now:
+                    self.memory.move_to_end(key)
+                    self.hits["memory"] += 1
+                    return value
+                del self.memory[key]
+
+            db = self._db()
+            row = db.execute("SELECT value, expires FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None or (row[1] is not None and row[1] <= now):
+                self.misses += 1
+                return None
+            db.execute("UPDATE llm_cache SET accessed = ? WHERE key = ?", (now, key))
+            value = [ChatGeneration(message=messages_from_dict([item["message"]])[0],
+                                    generation_info=item["info"])
+                     for item in json.loads(row[0])]
+            self._remember(key, row[1], value)
+            self.hits["disk"] += 1
+            return value
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        key = self._key(prompt, llm_string)
+        now = time.time()
+        expires = now + self.ttl if self.ttl is not None else None
+        value = json.dumps([{"message": message_to_dict(generation.message), "info": generation.generation_info}
+                            for generation in return_val])
+        with self.lock:
+            self._remember(key, expires, list(return_val))
+            db = self._db()
+            db.execute("INSERT OR REPLACE INTO llm_cache (key, value, expires, accessed) VALUES (?, ?, ?, ?)",
+                       (key, value, expires, now))
+            self.writes += 1
+            if self.writes % EVICT_EVERY == 0:
+                self._evict(db, now)
+
+    def _evict(self, db: sqlite3.Connection, now: float) -> None:
+        db.execute("DELETE FROM llm_cache WHERE expires IS NOT NULL AND expires <= ?", (now,))
+        db.execute(
+            "DELETE FROM llm_cache WHERE key IN ("
+            "SELECT key FROM llm_cache ORDER BY accessed DESC LIMIT -1 OFFSET ?)", (self.max_rows,))
+
+    def clear(self, **kwargs: Any) -> None:
+        with self.lock:
+            self.memory.clear()
+            self._db().execute("DELETE FROM llm_cache")
+
+    def stats(self) -> dict:
+        """Return hit and miss counts and the overall hit rate."""
+        hits = self.hits["memory"] + self.hits["disk"]
+        lookups = hits + self.misses
+        return {
+            "memory_hits": self.hits["memory"],
+            "disk_hits": self.hits["disk"],
+            "misses": self.misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
+
+
+_cache: Optional[TieredCache] = None
+
+
+def get_cache() -> Optional[TieredCache]:
+    """Return the process-wide LLM cache, or None if LLM_CACHE=off.
+
+    The SQLite file defaults to .llm_cache.sqlite and can be moved with
+    LLM_CACHE_PATH; LLM_CACHE_TTL sets the lifetime in seconds.
+    """
+    global _cache
+    if os.getenv("LLM_CACHE", "on").lower() in ("0", "off", "false", "no"):
+        return None
+    if _cache is None:
+        ttl = os.getenv("LLM_CACHE_TTL")
+        _cache = TieredCache(os.getenv("LLM_CACHE_PATH", DEFAULT_CACHE_PATH),
+                             ttl=float(ttl) if ttl else 7 * 24 * 3600)
+    return _cache
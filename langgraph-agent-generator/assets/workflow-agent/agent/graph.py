@@ -13,8 +13,12 @@ def route_workflow(state: WorkflowState) -> str:
     return step
 
 
-def create_workflow_agent():
-    """Create a workflow agent with conditional branching and retry logic."""
+def create_workflow_agent(checkpointer=None):
+    """Create a workflow agent with conditional branching and retry logic.
+
+    Pass a `checkpointer` (e.g. `SqliteDeltaSaver()`) to persist and resume
+    threads.
+    """
 
     graph = StateGraph(WorkflowState)
 
@@ -59,4 +63,4 @@ def create_workflow_agent():
     )
     graph.add_edge("complete", END)
 
-    return graph.compile()
+    return graph.compile(checkpointer=checkpointer)
@@ -1,47 +1,71 @@
-import os
-from langchain_openai import ChatOpenAI
+import asyncio
 from langchain_core.messages import AIMessage, SystemMessage
 
+from .llm import LazyLLM
+from .memory import HistoryCompactor
+from .resilience import CircuitBreaker, RetryPolicy
 from .state import WorkflowState
 
-llm = ChatOpenAI(
-    base_url="https://openrouter.ai/api/v1",
-    api_key=os.getenv("OPENROUTER_API_KEY"),
-    model="anthropic/claude-3.5-sonnet"
-)
+# Resolved through get_llm() on first use; retries are handled by
+# RETRY_POLICIES, not inside the client
+llm = LazyLLM(max_retries=0)
 
-MAX_RETRIES = 3
+# How each retryable step is retried; validation failures re-run `process`
+RETRY_POLICIES = {
+    "process": RetryPolicy(max_attempts=4, initial_interval=1.0, max_interval=30.0),
+}
 
+# Stops calling the provider after repeated transient failures
+breaker = CircuitBreaker(failure_threshold=5, reset_timeout=30.0)
 
-def initialize(state: WorkflowState) -> dict:
+# Older turns are summarized once the history passes this many tokens
+MAX_HISTORY_TOKENS = 8000
+
+compactor = HistoryCompactor(llm, max_tokens=MAX_HISTORY_TOKENS)
+
+
+def _failure(step: str, error: Exception, state: WorkflowState) -> dict:
+    """State update sending a failed step to `handle_error`."""
+    policy = RETRY_POLICIES[step]
+    retryable = policy.should_retry(error)
+    return {
+        "current_step": "handle_error",
+        "error": f"{type(error).__name__}: {error}",
+        "retry_step": step if retryable else None,
+        "retry_delay": policy.delay(state.get("retries", 0), error) if retryable else 0.0
+    }
+
+
+async def initialize(state: WorkflowState) -> dict:
     """Initialize the workflow."""
     return {
         "current_step": "process",
         "retries": 0,
         "data": {},
-        "error": None
+        "error": None,
+        "retry_step": None,
+        "retry_delay": 0.0
     }
 
 
-def process(state: WorkflowState) -> dict:
+async def process(state: WorkflowState) -> dict:
     """Main processing step."""
     try:
-        messages = state["messages"]
-        response = llm.invoke(messages)
+        async with breaker:
+            update, messages = await compactor.compact(state)
+            response = await llm.ainvoke(messages)
 
         return {
-            "messages": [AIMessage(content=response.content)],
+            **update,
+            "messages": update.get("messages", []) + [AIMessage(content=response.content)],
             "current_step": "validate",
             "data": {"result": response.content}
         }
     except Exception as e:
-        return {
-            "current_step": "handle_error",
-            "error": str(e)
-        }
+        return _failure("process", e, state)
 
 
-def validate(state: WorkflowState) -> dict:
+async def validate(state: WorkflowState) -> dict:
     """Validate the processing result."""
     data = state.get("data", {})
 
@@ -51,27 +75,40 @@ def validate(state: WorkflowState) -> dict:
     if is_valid:
         return {"current_step": "complete"}
     else:
-        return {"current_step": "handle_error", "error": "Validation failed"}
+        return {
+            "current_step": "handle_error",
+            "error": "Validation failed",
+            "retry_step": "process",
+            "retry_delay": 0.0
+        }
+
 
+async def handle_error(state: WorkflowState) -> dict:
+    """Retry the failed step after a backoff, or give up.
 
-def handle_error(state: WorkflowState) -> dict:
-    """Handle errors with retry logic."""
+    Only errors its retry policy accepts are retried, at most
+    `max_attempts` times in total; anything else fails the workflow at once.
+    """
     retries = state.get("retries", 0)
+    step = state.get("retry_step")
+    policy = RETRY_POLICIES.get(step)
 
-    if retries < MAX_RETRIES:
+    if policy is not None and retries + 1 < policy.max_attempts:
+        await asyncio.sleep(state.get("retry_delay") or 0.0)
         return {
-            "current_step": "process",
+            "current_step": step,
             "retries": retries + 1,
-            "error": None
+            "error": None,
+            "retry_step": None
         }
     else:
         return {
             "current_step": "failed",
-            "messages": [AIMessage(content=f"Workflow failed after {MAX_RETRIES} retries: {state.get('error')}")]
+            "messages": [AIMessage(content=f"Workflow failed after {retries + 1} attempt(s): {state.get('error')}")]
         }
 
 
-def complete(state: WorkflowState) -> dict:
+async def complete(state: WorkflowState) -> dict:
     """Complete the workflow successfully."""
     return {
         "messages": [AIMessage(content="Workflow completed successfully!")],
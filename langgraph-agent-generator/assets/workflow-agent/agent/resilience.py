@@ -0,0 +1,117 @@
+import asyncio
+import random
+import time
+from typing import Callable, Optional
+
+# HTTP statuses worth retrying: timeouts, conflicts, throttling and server errors
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling the provider while the circuit is open."""
+
+
+def is_retryable(error: BaseException) -> bool:
+    """True for transient provider errors (throttling, timeouts, 5xx, dropped connections)."""
+    if isinstance(error, CircuitOpenError):
+        return False
+    # Imported here so loading the agent doesn't pull in the HTTP stack
+    import httpx
+    import openai
+
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in RETRYABLE_STATUS
+    return isinstance(error, (openai.APIConnectionError, httpx.TransportError,
+                              asyncio.TimeoutError, ConnectionError))
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """Seconds the provider asked us to wait (Retry-After header), if any."""
+    response = getattr(error, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+class RetryPolicy:
+    """When and how long to wait before re-running a failed node.
+
+    A node is attempted at most `max_attempts` times in total. Attempt `n`
+    waits `initial_interval * backoff_factor ** n`, capped at `max_interval`;
+    with `jitter` the wait is drawn uniformly from [0, that], so clients that
+    failed together don't retry together. A Retry-After header from the
+    provider is honoured as a minimum. Only errors accepted by `retry_on`
+    are retried.
+    """
+
+    def __init__(self, max_attempts: int = 3, initial_interval: float = 1.0, backoff_factor: float = 2.0,
+                 max_interval: float = 30.0, jitter: bool = True,
+                 retry_on: Callable[[BaseException], bool] = is_retryable):
+        self.max_attempts = max_attempts
+        self.initial_interval = initial_interval
+        self.backoff_factor = backoff_factor
+        self.max_interval = max_interval
+        self.jitter = jitter
+        self.retry_on = retry_on
+
+    def should_retry(self, error: BaseException) -> bool:
+        return self.max_attempts > 1 and self.retry_on(error)
+
+    def delay(self, attempt: int, error: Optional[BaseException] = None) -> float:
+        """Seconds to wait before retry number `attempt + 1`."""
+        delay = min(self.max_interval, self.initial_interval * self.backoff_factor ** attempt)
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        requested = retry_after(error) if error is not None else None
+        if requested is not None:
+            delay = max(delay, min(requested, self.max_interval))
+        return delay
+
+
+class CircuitBreaker:
+    """Fail fast while the provider is down instead of piling on retries.
+
+    After `failure_threshold` consecutive retryable failures the circuit
+    opens and calls raise CircuitOpenError without reaching the provider.
+    After `reset_timeout` seconds one trial call is let through; success
+    closes the circuit, failure opens it again.
+
+        async with breaker:
+            response = await llm.ainvoke(messages)
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_running = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    async def __aenter__(self):
+        state = self.state
+        if state == "open" or (state == "half-open" and self.trial_running):
+            raise CircuitOpenError(f"circuit open after {self.failures} consecutive failures")
+        if state == "half-open":
+            self.trial_running = True
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.trial_running = False
+        if exc is None:
+            self.failures = 0
+            self.opened_at = None
+        elif is_retryable(exc):
+            self.failures += 1
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+        return False
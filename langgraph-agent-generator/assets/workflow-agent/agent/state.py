@@ -1,11 +1,40 @@
 from typing import Annotated, TypedDict, Optional
+from langchain_core.messages import HumanMessage
 from langgraph.graph.message import add_messages
 
 
 class WorkflowState(TypedDict):
     """State for the workflow agent."""
     messages: Annotated[list, add_messages]
+    summary: str
     current_step: str
     retries: int
     data: Optional[dict]
     error: Optional[str]
+    retry_step: Optional[str]
+    retry_delay: float
+
+
+def initial_state(prompt: str) -> WorkflowState:
+    """Build the graph input for a single user prompt."""
+    return {
+        "messages": [HumanMessage(content=prompt)],
+        "summary": "",
+        "current_step": "initialize",
+        "retries": 0,
+        "data": None,
+        "error": None,
+        "retry_step": None,
+        "retry_delay": 0.0
+    }
+
+
+def follow_up_state(prompt: str) -> WorkflowState:
+    """Build the graph input for a new prompt on an existing thread.
+
+    Like `initial_state()`, but leaves the thread's rolling summary alone:
+    the messages it condenses have already been removed from the state.
+    """
+    state = initial_state(prompt)
+    del state["summary"]
+    return state
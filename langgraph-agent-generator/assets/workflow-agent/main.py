@@ -1,31 +1,128 @@
-import os
+import argparse
+import asyncio
 from dotenv import load_dotenv
-from langchain_core.messages import HumanMessage
 
-from agent import create_workflow_agent
+from agent import create_workflow_agent, follow_up_state, initial_state, run_batch
+from agent.cache import get_cache
+from agent.llm import INTERNAL_TAG
+from agent.checkpoint import SqliteDeltaSaver
 
 load_dotenv()
 
 
-def main():
+def print_result(result):
+    print("=== Workflow Result ===")
+    print(f"Final step: {result.get('current_step')}")
+    for message in result["messages"]:
+        print(f"{message.type}: {message.content}")
+
+
+async def stream_run(app, state, config=None):
+    """Print node transitions, tool calls and LLM tokens as they arrive.
+
+    Each model call's tokens are labelled with its node. One call streams
+    live; calls running alongside it (e.g. parallel workers) are buffered
+    and printed whole when they finish, so their tokens don't interleave.
+    Internal calls (routing, summaries) are not shown.
+    """
+    live = None
+    buffers = {}
+    async for event in app.astream_events(state, config, version="v2"):
+        kind = event["event"]
+        node = event["metadata"].get("langgraph_node")
+        run_id = event["run_id"]
+        if kind.startswith("on_chat_model") and INTERNAL_TAG in event.get("tags", ()):
+            continue
+        if kind == "on_chain_start" and event["name"] == node:
+            print(f"\n--- {node} ---", flush=True)
+        elif kind == "on_chat_model_start":
+            if live is None:
+                live = run_id
+                print(f"[{node}] ", end="", flush=True)
+            else:
+                buffers[run_id] = []
+        elif kind == "on_chat_model_stream":
+            content = event["data"]["chunk"].content
+            if content and run_id == live:
+                print(content, end="", flush=True)
+            elif content and run_id in buffers:
+                buffers[run_id].append(content)
+        elif kind == "on_chat_model_end":
+            if run_id == live:
+                live = None
+                print(flush=True)
+            elif run_id in buffers:
+                print(f"[{node}] {''.join(buffers.pop(run_id))}", flush=True)
+        elif kind == "on_tool_start":
+            print(f"[{event['name']}] {event['data'].get('input')}", flush=True)
+        elif kind == "on_tool_end":
+            print(f"[{event['name']}] -> {event['data'].get('output')}", flush=True)
+    print()
+
+
+async def run(args):
+    """Run the graph on one prompt, a batch file or in streaming mode."""
+    # Persist the thread so it can be resumed after a crash
+    checkpointer = SqliteDeltaSaver() if args.thread and not args.batch else None
+    config = {"configurable": {"thread_id": args.thread}} if args.thread else None
+
     # Create the workflow agent
-    app = create_workflow_agent()
+    app = create_workflow_agent(checkpointer=checkpointer)
+
+    # Run many prompts concurrently
+    if args.batch:
+        with open(args.batch) as f:
+            prompts = [line.strip() for line in f if line.strip()]
+        results = await run_batch(prompts, app, args.concurrency)
+        for prompt, result in zip(prompts, results):
+            print(f"\n>>> {prompt}")
+            if isinstance(result, Exception):
+                print(f"error: {result}")
+            else:
+                print_result(result)
+        return
+
+    # Resuming continues from the last checkpoint instead of starting over;
+    # a new prompt on an existing thread keeps its rolling summary
+    if args.resume:
+        state = None
+    elif config and (await app.aget_state(config)).values:
+        state = follow_up_state(args.prompt)
+    else:
+        state = initial_state(args.prompt)
+
+    # Stream tokens and node transitions
+    if args.stream:
+        await stream_run(app, state, config)
+        return
 
     # Run the workflow
-    result = app.invoke({
-        "messages": [HumanMessage(content="Process this data and validate the result")],
-        "current_step": "initialize",
-        "retries": 0,
-        "data": None,
-        "error": None
-    })
+    result = await app.ainvoke(state, config)
 
     # Print the result
-    print("=== Workflow Result ===")
-    print(f"Final step: {result.get('current_step')}")
-    for message in result["messages"]:
-        print(f"{message.type}: {message.content}")
+    print_result(result)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Run the workflow agent")
+    parser.add_argument("prompt", nargs="?", default="Process this data and validate the result")
+    parser.add_argument("--batch", metavar="FILE", help="Run each line of FILE as a separate prompt")
+    parser.add_argument("--concurrency", type=int, default=8, help="Runs in flight at once with --batch")
+    parser.add_argument("--stream", action="store_true", help="Print tokens and node transitions as they arrive")
+    parser.add_argument("--cache-stats", action="store_true", help="Print LLM cache hit rate when done")
+    parser.add_argument("--thread", metavar="ID", help="Checkpoint this run to .checkpoints.sqlite under thread ID")
+    parser.add_argument("--resume", action="store_true", help="Continue the interrupted run of --thread")
+    args = parser.parse_args()
+    if args.resume and not args.thread:
+        parser.error("--resume requires --thread")
+
+    try:
+        await run(args)
+    finally:
+        cache = get_cache()
+        if args.cache_stats and cache is not None:
+            print(f"LLM cache: {cache.stats()}")
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
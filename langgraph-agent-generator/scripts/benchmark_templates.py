@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+"""
+Benchmark the LangGraph templates offline.
+Usage: python benchmark_templates.py [--templates react-agent,multi-agent,workflow-agent]
+                                     [--concurrency 1,8,32] [--runs 64] [--latency 0.05]
+                                     [--tokens 50] [--tool-calls 2] [--subtasks 3]
+                                     [--server] [--output FILE]
+
+Every LLM call is answered by a deterministic fake chat model with a fixed
+latency, so runs cost nothing and are repeatable. With --server the calls
+go over HTTP to a local OpenAI-compatible stub server instead, which also
+measures the client stack. Each template runs in a fresh interpreter
+because all of them are packages named `agent`.
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ASSETS_DIR = os.path.join(os.path.dirname(SCRIPT_DIR), "assets")
+
+# Template directory -> (factory in `agent`, default prompt)
+TEMPLATES = {
+    "react-agent": ("create_agent", "What is 6 * 7?"),
+    "multi-agent": ("create_multi_agent", "Research the history of solar power and write a short report"),
+    "workflow-agent": ("create_workflow_agent", "Summarize why automated tests matter"),
+}
+DEFAULT_CONCURRENCY = "1,8,32"
+
+# Arguments the fake model passes to the template tools it knows
+TOOL_ARGS = {"calculator": {"expression": "6 * 7"}, "search": {"query": "benchmark"}}
+
+WORDS = ["graph", "agent", "state", "token", "node", "edge", "model", "reply"]
+
+# Runs per template timed with per-node callbacks, after the throughput runs
+PROFILE_RUNS = 20
+
+
+def filler(tokens):
+    return " ".join(WORDS[i % len(WORDS)] for i in range(tokens))
+
+
+def script_reply(turns, tools, settings):
+    """Decide a fake reply from the conversation.
+
+    `turns` is a list of (role, content) pairs using OpenAI role names. Models
+    with tools bound call `settings.tool_calls` tools at once unless they
+    have just received tool results; the research planner gets
+    `settings.subtasks` subtasks; everything else gets `settings.tokens`
+    words. Returns (content, tool calls).
+    """
+    if tools and settings.tool_calls and turns and turns[-1][0] != "tool":
+        calls = []
+        for i in range(settings.tool_calls):
+            name = tools[i % len(tools)]
+            calls.append({"id": f"call_{len(turns)}_{i}", "name": name, "args": TOOL_ARGS.get(name, {})})
+        return "", calls
+    system = " ".join(content for role, content in turns if role == "system")
+    if "one subtask per line" in system:
+        return "\n".join(f"Subtask {i + 1}: {filler(5)}" for i in range(settings.subtasks)), []
+    return filler(settings.tokens), []
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of `values` (q in 0-100)."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q / 100 * len(ordered)) - 1))]
+
+
+def covered(intervals):
+    """Total time covered by (start, end) intervals, counting overlaps once."""
+    total, last = 0.0, None
+    for start, end in sorted(intervals):
+        if last is not None and start < last:
+            start = last
+        if end > start:
+            total += end - start
+        last = end if last is None else max(last, end)
+    return total
+
+
+# Stub server
+
+class StubHandler(BaseHTTPRequestHandler):
+    """OpenAI-compatible /chat/completions endpoint with scripted replies."""
+
+    # Keep-alive, so pooled client connections are actually reused; without
+    # TCP_NODELAY the separate header and body writes stall on delayed ACKs
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    settings = None
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        time.sleep(self.settings.latency)
+        turns = [(message["role"], str(message.get("content") or "")) for message in body["messages"]]
+        tools = [tool["function"]["name"] for tool in body.get("tools", [])]
+        content, calls = script_reply(turns, tools, self.settings)
+        message = {"role": "assistant", "content": content}
+        if calls:
+            message["tool_calls"] = [
+                {"id": call["id"], "type": "function",
+                 "function": {"name": call["name"], "arguments": json.dumps(call["args"])}}
+                for call in calls
+            ]
+        prompt_tokens = sum(len(text) for _, text in turns) // 4
+        completion_tokens = len(content.split()) + 10 * len(calls)
+        data = json.dumps({
+            "id": "chatcmpl-benchmark",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "benchmark"),
+            "choices": [{"index": 0, "message": message, "finish_reason": "tool_calls" if calls else "stop"}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                      "total_tokens": prompt_tokens + completion_tokens},
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def serve(args):
+    """Run the stub server on a free port, printing the port once listening."""
+    StubHandler.settings = args
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    print(server.server_address[1], flush=True)
+    server.serve_forever()
+
+
+def start_server(args):
+    """Start the stub server in its own process and return (process, base URL)."""
+    command = [sys.executable, os.path.abspath(__file__), "--serve",
+               "--latency", str(args.latency), "--tokens", str(args.tokens),
+               "--tool-calls", str(args.tool_calls), "--subtasks", str(args.subtasks)]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    port = int(process.stdout.readline())
+    return process, f"http://127.0.0.1:{port}/v1"
+
+
+# Template runs (in the child interpreter)
+
+def fake_chat_model(settings):
+    """Build the in-process fake chat model (imports langchain_core lazily)."""
+    from langchain_core.language_models.chat_models import BaseChatModel
+    from langchain_core.messages import AIMessage
+    from langchain_core.outputs import ChatGeneration, ChatResult
+
+    roles = {"human": "user", "ai": "assistant"}
+
+    class FakeChatModel(BaseChatModel):
+        """Deterministic chat model with a fixed latency and scripted replies."""
+
+        latency: float = 0.05
+
+        @property
+        def _llm_type(self):
+            return "benchmark-fake"
+
+        def bind_tools(self, tools, **kwargs):
+            return self.bind(tools=[tool.name for tool in tools])
+
+        def _reply(self, messages, tools):
+            turns = [(roles.get(message.type, message.type), str(message.content)) for message in messages]
+            content, calls = script_reply(turns, tools or [], settings)
+            prompt_tokens = sum(len(text) for _, text in turns) // 4
+            completion_tokens = len(content.split()) + 10 * len(calls)
+            message = AIMessage(content=content, tool_calls=calls, usage_metadata={
+                "input_tokens": prompt_tokens, "output_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens})
+            return ChatResult(generations=[ChatGeneration(message=message)])
+
+        def _generate(self, messages, stop=None, run_manager=None, tools=None, **kwargs):
+            time.sleep(self.latency)
+            return self._reply(messages, tools)
+
+        async def _agenerate(self, messages, stop=None, run_manager=None, tools=None, **kwargs):
+            await asyncio.sleep(self.latency)
+            return self._reply(messages, tools)
+
+    return FakeChatModel(latency=settings.latency)
+
+
+def node_timer():
+    """Build a callback handler recording node and LLM call intervals for one run."""
+    from langchain_core.callbacks import BaseCallbackHandler
+
+    class NodeTimer(BaseCallbackHandler):
+        # Called directly in the event loop, not on a worker thread
+        run_inline = True
+
+        def __init__(self):
+            self.open = {}
+            self.nodes = []
+            self.llm = []
+
+        def on_chain_start(self, serialized, inputs, *, run_id, metadata=None, **kwargs):
+            node = (metadata or {}).get("langgraph_node")
+            # Graph nodes run as chains named after the node
+            if node is not None and kwargs.get("name") == node:
+                self.open[run_id] = (node, time.perf_counter())
+
+        def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, **kwargs):
+            self.open[run_id] = ((metadata or {}).get("langgraph_node"), time.perf_counter())
+
+        def _close(self, run_id, intervals):
+            if run_id in self.open:
+                node, start = self.open.pop(run_id)
+                intervals.append((node, start, time.perf_counter()))
+
+        def on_chain_end(self, outputs, *, run_id, **kwargs):
+            self._close(run_id, self.nodes)
+
+        def on_chain_error(self, error, *, run_id, **kwargs):
+            self._close(run_id, self.nodes)
+
+        def on_llm_end(self, response, *, run_id, **kwargs):
+            self._close(run_id, self.llm)
+
+        def on_llm_error(self, error, *, run_id, **kwargs):
+            self._close(run_id, self.llm)
+
+    return NodeTimer()
+
+
+async def run_level(app, make_input, runs, concurrency):
+    """Run `runs` graphs with at most `concurrency` in flight; return throughput and latency."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            await app.ainvoke(make_input())
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(runs)))
+    seconds = time.perf_counter() - start
+    return {
+        "concurrency": concurrency,
+        "runs": runs,
+        "seconds": seconds,
+        "runs_per_second": runs / seconds,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+async def profile(app, make_input, runs):
+    """Time each node and its LLM calls over sequential runs.
+
+    A node's overhead is its time minus the LLM calls made inside it; the
+    graph's overhead is run latency not covered by any node.
+    """
+    nodes = {}
+    latency = covered_total = llm_calls = 0.0
+    for _ in range(runs):
+        timer = node_timer()
+        start = time.perf_counter()
+        await app.ainvoke(make_input(), {"callbacks": [timer]})
+        latency += time.perf_counter() - start
+        covered_total += covered([(start, end) for _, start, end in timer.nodes])
+        llm_calls += len(timer.llm)
+        for node, start, end in timer.nodes:
+            stats = nodes.setdefault(node, {"calls": 0, "seconds": 0.0, "llm_calls": 0, "llm_seconds": 0.0})
+            stats["calls"] += 1
+            stats["seconds"] += end - start
+        for node, start, end in timer.llm:
+            stats = nodes.setdefault(node, {"calls": 0, "seconds": 0.0, "llm_calls": 0, "llm_seconds": 0.0})
+            stats["llm_calls"] += 1
+            stats["llm_seconds"] += end - start
+
+    return {
+        "runs": runs,
+        "latency_ms": latency / runs * 1000,
+        "graph_overhead_ms": (latency - covered_total) / runs * 1000,
+        "llm_calls_per_run": llm_calls / runs,
+        "nodes": {
+            node: {
+                "calls_per_run": stats["calls"] / runs,
+                "mean_ms": stats["seconds"] / stats["calls"] * 1000 if stats["calls"] else 0.0,
+                "llm_calls_per_run": stats["llm_calls"] / runs,
+                "overhead_ms": (stats["seconds"] - stats["llm_seconds"]) / stats["calls"] * 1000
+                if stats["calls"] else 0.0,
+            }
+            for node, stats in nodes.items()
+        },
+    }
+
+
+def run_template(name, args):
+    """Benchmark one template in the current process and return its measurements."""
+    # No real provider, cache or throttling may leak into the numbers
+    os.environ.update({"OPENROUTER_API_KEY": "benchmark", "LLM_CACHE": "off", "LLM_RATE_LIMIT": "off"})
+    sys.path.insert(0, os.path.join(ASSETS_DIR, name))
+    start = time.perf_counter()
+    agent = importlib.import_module("agent")
+    import_seconds = time.perf_counter() - start
+
+    llm = importlib.import_module("agent.llm")
+    if args.server_url:
+        llm.set_llm(llm.get_llm("benchmark", base_url=args.server_url))
+    else:
+        llm.set_llm(fake_chat_model(args))
+
+    factory, prompt = TEMPLATES[name]
+    app = getattr(agent, factory)()
+    prompt = args.prompt or prompt
+
+    def make_input():
+        return agent.initial_state(prompt)
+
+    async def bench():
+        # Warm up clients and lazily built state before timing
+        await app.ainvoke(make_input())
+        levels = [await run_level(app, make_input, max(args.runs, concurrency), concurrency)
+                  for concurrency in (int(level) for level in args.concurrency.split(","))]
+        return levels, await profile(app, make_input, min(args.runs, PROFILE_RUNS))
+
+    levels, nodes = asyncio.run(bench())
+    return {"template": name, "import_seconds": import_seconds, "levels": levels, "profile": nodes}
+
+
+def measure(name, args):
+    """Run one template in a fresh interpreter and return its measurements."""
+    command = [sys.executable, os.path.abspath(__file__), "--run-template", name,
+               "--concurrency", args.concurrency, "--runs", str(args.runs),
+               "--latency", str(args.latency), "--tokens", str(args.tokens),
+               "--tool-calls", str(args.tool_calls), "--subtasks", str(args.subtasks)]
+    if args.prompt:
+        command += ["--prompt", args.prompt]
+    if args.server_url:
+        command += ["--server-url", args.server_url]
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"{name} failed: {result.stderr.strip()}")
+    return json.loads(result.stdout)
+
+
+def print_result(result):
+    name = result["template"]
+    print(f"{name} (import {result['import_seconds'] * 1000:.0f} ms)", file=sys.stderr)
+    for level in result["levels"]:
+        print(f"  c={level['concurrency']:<4} {level['runs_per_second']:>8.1f} runs/s "
+              f"p50 {level['p50_ms']:>8.1f} ms  p99 {level['p99_ms']:>8.1f} ms", file=sys.stderr)
+    profile = result["profile"]
+    print(f"  {profile['llm_calls_per_run']:.1f} LLM calls/run, "
+          f"graph overhead {profile['graph_overhead_ms']:.2f} ms/run", file=sys.stderr)
+    for node, stats in profile["nodes"].items():
+        print(f"    {node:<16} {stats['calls_per_run']:>5.1f}x {stats['mean_ms']:>8.2f} ms "
+              f"(overhead {stats['overhead_ms']:.2f} ms)", file=sys.stderr)
+
+
+def package_version(name):
+    try:
+        from importlib.metadata import version
+        return version(name)
+    except Exception:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the LangGraph templates offline")
+    parser.add_argument("--templates", default=",".join(TEMPLATES),
+                        help="Comma-separated templates to run")
+    parser.add_argument("--concurrency", default=DEFAULT_CONCURRENCY,
+                        help=f"Comma-separated runs in flight at once (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--runs", type=int, default=64,
+                        help="Graph runs per concurrency level (at least the concurrency)")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds each LLM call takes")
+    parser.add_argument("--tokens", type=int, default=50, help="Words in each plain LLM reply")
+    parser.add_argument("--tool-calls", type=int, default=2,
+                        help="Parallel tool calls the ReAct model makes before answering")
+    parser.add_argument("--subtasks", type=int, default=3, help="Subtasks the research planner returns")
+    parser.add_argument("--prompt", help="Prompt for every run instead of each template's default")
+    parser.add_argument("--server", action="store_true",
+                        help="Answer over HTTP from a local OpenAI-compatible stub server")
+    parser.add_argument("--output", metavar="FILE", help="Write the JSON report here instead of stdout")
+    parser.add_argument("--run-template", help=argparse.SUPPRESS)
+    parser.add_argument("--server-url", help=argparse.SUPPRESS)
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args)
+        return
+    if args.run_template:
+        json.dump(run_template(args.run_template, args), sys.stdout)
+        return
+
+    server = None
+    if args.server:
+        server, args.server_url = start_server(args)
+    try:
+        results = []
+        for name in args.templates.split(","):
+            if name not in TEMPLATES:
+                parser.error(f"unknown template: {name}")
+            result = measure(name, args)
+            results.append(result)
+            print_result(result)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "langgraph": package_version("langgraph"),
+        "platform": platform.platform(),
+        "settings": {"mode": "server" if args.server else "fake", "latency": args.latency,
+                     "tokens": args.tokens, "tool_calls": args.tool_calls, "subtasks": args.subtasks},
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()